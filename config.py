@@ -1,6 +1,9 @@
 import os
 from dotenv import load_dotenv
 
+# 配置是否已通过校验（多个入口重复调用 validate 时直接返回）
+_VALIDATED = False
+
 # 加载 .env 文件
 load_dotenv()
 
@@ -34,7 +37,6 @@ class TradingConfig:
     # 保留比例模式（未来可能需要）
     TRADE_RATIO = 0.10                # 比例模式：10%（USE_FIXED_AMOUNT=False时生效）
     MIN_TRADE_AMOUNT = 10.0           # 最小交易金额 $10
-    MIN_TRADE_AMOUNT = 10.0  # 最小交易金额 $10
     
     # 筛选总开关
     ENABLE_FILTERING = False  # True=启用筛选, False=完全跟单不筛选
@@ -45,12 +47,55 @@ class TradingConfig:
     MAX_MARKET_CAP = 5000000.0  # 最大市值 $5M (设为float('inf')则不限制)
     
     # 黑名单
-    BLACKLIST_TOKENS = []  # 代币地址黑名单
+    BLACKLIST_TOKENS = frozenset()  # 代币地址黑名单（frozenset，O(1) 查找）
     
     # 虚拟资金管理
     ALLOW_VIRTUAL_DEPOSIT = True  # 允许虚拟入金
     ALLOW_VIRTUAL_WITHDRAWAL = False  # 允许虚拟出金
 
+    @classmethod
+    def build_filter(cls):
+        """
+        根据当前筛选配置生成筛选函数
+        
+        阈值在构建时绑定为闭包变量，未生效的条件直接跳过；
+        配置变更后需重新调用本方法
+        
+        返回:
+            callable - fn(signal, price_info) -> (是否通过, 原因)
+        """
+        if not cls.ENABLE_FILTERING:
+            return lambda signal, price_info: (True, "未启用筛选")
+        
+        blacklist = frozenset(cls.BLACKLIST_TOKENS)
+        min_liquidity = cls.MIN_LIQUIDITY
+        min_market_cap = cls.MIN_MARKET_CAP
+        max_market_cap = cls.MAX_MARKET_CAP
+        check_liquidity = min_liquidity > 0
+        check_min_cap = min_market_cap > 0
+        check_max_cap = max_market_cap < float('inf')
+        
+        def check(signal, price_info):
+            # 1. 黑名单检查
+            if signal.token_mint in blacklist:
+                return False, f"代币在黑名单中: {signal.token_symbol}"
+            
+            # 2. 流动性检查
+            if check_liquidity and price_info.liquidity < min_liquidity:
+                return False, f"流动性不足: ${price_info.liquidity:,.0f} < ${min_liquidity:,.0f}"
+            
+            # 3. 市值检查（最小值）
+            if check_min_cap and price_info.market_cap < min_market_cap:
+                return False, f"市值过低: ${price_info.market_cap:,.0f} < ${min_market_cap:,.0f}"
+            
+            # 4. 市值检查（最大值）
+            if check_max_cap and price_info.market_cap > max_market_cap:
+                return False, f"市值过高: ${price_info.market_cap:,.0f} > ${max_market_cap:,.0f}"
+            
+            return True, "通过所有筛选"
+        
+        return check
+
 
 # ==================== 风险控制配置 ====================
 class RiskConfig:
@@ -98,9 +143,13 @@ class SystemConfig:
     # 滑点模拟（保持原有BPS逻辑）
     SLIPPAGE_MIN_BPS = 50   # 0.5%
     SLIPPAGE_MAX_BPS = 5000  # 50%
+    # 小数形式（导入时换算一次，成交路径无需再除以 10000）
+    SLIPPAGE_MIN = SLIPPAGE_MIN_BPS / 10000.0
+    SLIPPAGE_MAX = SLIPPAGE_MAX_BPS / 10000.0
     
     # 价格缓存
     PRICE_CACHE_TTL = 5  # 价格缓存时间 5秒
+    PRICE_NEGATIVE_CACHE_TTL = 30  # 查询失败的代币在此时间内不再请求（秒）
     
     # 轮询设置
     POLL_INTERVAL = 20  # 轮询间隔（秒）
@@ -116,6 +165,7 @@ class SystemConfig:
     ASSET_SYNC_MAX_RETRIES = 5  # 资产同步最大重试次数
     ASSET_SYNC_RETRY_DELAY = 2  # 资产同步重试延迟（秒）
     PRICE_UPDATE_INTERVAL = 5  # 定期价格更新间隔
+    ENABLE_PRICE_UPDATER = False  # 启用独立价格更新线程（只刷新价格，不重拉资产）
     
     # 资产过滤设置
     MIN_ASSET_DISPLAY_VALUE = 1.0  # 资产显示的最小价值阈值（USD）
@@ -124,6 +174,7 @@ class SystemConfig:
     PRICE_SOURCE_STRATEGY = "fallback"  # 选项: "single"(仅用第一个) / "fallback"(失败切换)
     PRICE_SOURCES = ["Helius"]  # 价格源列表，按优先级排序。可选: "Helius", "Jupiter", "Raydium"
     PRICE_SOURCE_TIMEOUT = 10  # 每个源的超时时间（秒）
+    PRICE_BATCH_CONCURRENCY = 32  # 批量查价的最大并发请求数（注意 Helius 限流）
 
     # 虚拟交易会话管理
     VIRTUAL_SESSION_AUTO_BACKUP = True  # 重置时自动备份旧会话
@@ -133,91 +184,39 @@ class SystemConfig:
     
 # ==================== 主配置类（向后兼容）====================
 class Config:
-    """主配置类 - 保持所有现有代码兼容"""
-    
-    # ==================== API 设置 ====================
-    HELIUS_API_KEY = BaseConfig.HELIUS_API_KEY
-    
-    # ==================== 监控设置 ====================
-    TARGET_WALLET = BaseConfig.TARGET_WALLET
+    """
+    主配置类 - 保持所有现有代码兼容
     
-    # ==================== 轮询设置 ====================
-    POLL_INTERVAL = SystemConfig.POLL_INTERVAL
-    POLL_TRANSACTION_LIMIT = SystemConfig.POLL_TRANSACTION_LIMIT
-    INIT_BACKFILL_LIMIT = SystemConfig.INIT_BACKFILL_LIMIT
-    
-    # ==================== 资产更新设置 ====================
-    ASSET_SYNC_MAX_RETRIES = SystemConfig.ASSET_SYNC_MAX_RETRIES
-    ASSET_SYNC_RETRY_DELAY = SystemConfig.ASSET_SYNC_RETRY_DELAY
-    PRICE_UPDATE_INTERVAL = SystemConfig.PRICE_UPDATE_INTERVAL
-    
-    # ==================== 资产过滤设置 ====================
-    MIN_ASSET_DISPLAY_VALUE = SystemConfig.MIN_ASSET_DISPLAY_VALUE
-    
-    # ==================== 虚拟交易设置 ====================
-    MY_PRIVATE_KEY = BaseConfig.MY_PRIVATE_KEY
-    MY_WALLET_ADDRESS = BaseConfig.MY_WALLET_ADDRESS
-    
-    # === 滑点设置 ===
-    SLIPPAGE_MAX_BPS = SystemConfig.SLIPPAGE_MAX_BPS
-    SLIPPAGE_MIN_BPS = SystemConfig.SLIPPAGE_MIN_BPS
-    
-    # === 爆发模式设置 ===
-    IDLE_INTERVAL = SystemConfig.IDLE_INTERVAL
-    BURST_INTERVAL = SystemConfig.BURST_INTERVAL
-    BURST_DURATION = SystemConfig.BURST_DURATION
+    各分组配置的常量在导入时一次性扁平化到本类（见文件末尾），
+    新增配置项无需在此重复登记
+    """
 
     @staticmethod
     def validate():
-        """启动前检查配置是否完整"""
+        """启动前检查配置是否完整（通过一次后不再重复检查）"""
+        global _VALIDATED
+        if _VALIDATED:
+            return True
+        
         if not Config.HELIUS_API_KEY:
             raise ValueError("❌ 缺少 HELIUS_API_KEY，请检查 .env 文件")
         if not Config.TARGET_WALLET:
             raise ValueError("❌ 缺少 TARGET_WALLET，请检查 .env 文件")
         
         print("✅ 配置检查通过")
+        _VALIDATED = True
         return True
 
-    # ==================== 价格查询设置 ====================
-    PRICE_SOURCE_STRATEGY = SystemConfig.PRICE_SOURCE_STRATEGY
-    PRICE_SOURCES = SystemConfig.PRICE_SOURCES
-    PRICE_SOURCE_TIMEOUT = SystemConfig.PRICE_SOURCE_TIMEOUT
-
-    # ==================== 交易策略设置 ====================
-    ENABLE_FILTERING = TradingConfig.ENABLE_FILTERING
-    MIN_LIQUIDITY = TradingConfig.MIN_LIQUIDITY
-    MIN_MARKET_CAP = TradingConfig.MIN_MARKET_CAP
-    MAX_MARKET_CAP = TradingConfig.MAX_MARKET_CAP
-    BLACKLIST_TOKENS = TradingConfig.BLACKLIST_TOKENS
-    ALLOW_VIRTUAL_DEPOSIT = TradingConfig.ALLOW_VIRTUAL_DEPOSIT
-    ALLOW_VIRTUAL_WITHDRAWAL = TradingConfig.ALLOW_VIRTUAL_WITHDRAWAL
-    
-    # ==================== 风险控制设置 ====================
-    STOP_LOSS_PERCENT = RiskConfig.STOP_LOSS_PERCENT
-    TAKE_PROFIT_PERCENT = RiskConfig.TAKE_PROFIT_PERCENT
-    MAX_HOLD_TIME = RiskConfig.MAX_HOLD_TIME
-    MAX_DRAWDOWN = RiskConfig.MAX_DRAWDOWN
-    
-    # ==================== 会话管理设置 ====================
-    VIRTUAL_SESSION_AUTO_BACKUP = SystemConfig.VIRTUAL_SESSION_AUTO_BACKUP
-    VIRTUAL_SESSION_PREFIX = SystemConfig.VIRTUAL_SESSION_PREFIX
-    ENABLE_BALANCE_HISTORY = SystemConfig.ENABLE_BALANCE_HISTORY
-    ENABLE_SESSION_METADATA = SystemConfig.ENABLE_SESSION_METADATA
-
-    # ==================== 策略配置（未来扩展）====================
-    ENABLE_RECOVER_PRINCIPAL = StrategyConfig.ENABLE_RECOVER_PRINCIPAL
-    RECOVER_PRINCIPAL_THRESHOLD = StrategyConfig.RECOVER_PRINCIPAL_THRESHOLD
-    ENABLE_TRAILING_STOP = StrategyConfig.ENABLE_TRAILING_STOP
-    TRAILING_STOP_PERCENT = StrategyConfig.TRAILING_STOP_PERCENT
-    ENABLE_PARTIAL_TAKE_PROFIT = StrategyConfig.ENABLE_PARTIAL_TAKE_PROFIT
-    PARTIAL_LEVELS = StrategyConfig.PARTIAL_LEVELS
-    
-    # ==================== 仓位管理 ====================
-    USE_FIXED_AMOUNT = TradingConfig.USE_FIXED_AMOUNT
-    FIXED_TRADE_AMOUNT = TradingConfig.FIXED_TRADE_AMOUNT
-    
-    # ==================== 更新风控配置 ====================
-    MAX_CONSECUTIVE_LOSSES = RiskConfig.MAX_CONSECUTIVE_LOSSES
-    STOP_AFTER_TRIGGER_HOURS = RiskConfig.STOP_AFTER_TRIGGER_HOURS
-    ENABLE_POSITION_STOP_LOSS = RiskConfig.ENABLE_POSITION_STOP_LOSS
-    ENABLE_POSITION_TAKE_PROFIT = RiskConfig.ENABLE_POSITION_TAKE_PROFIT
+    @staticmethod
+    def invalidate():
+        """清除校验结果，下次 validate 重新检查（测试或热重载时使用）"""
+        global _VALIDATED
+        _VALIDATED = False
+
+
+# 导入时解析一次：把各分组配置的常量直接挂到 Config 上
+for _section in (BaseConfig, TradingConfig, RiskConfig, StrategyConfig, SystemConfig):
+    for _name, _value in vars(_section).items():
+        if _name.isupper():
+            setattr(Config, _name, _value)
+del _section, _name, _value
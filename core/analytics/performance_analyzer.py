@@ -7,11 +7,30 @@
 - 生成性能报告
 """
 
+import time
 from dataclasses import dataclass
+from itertools import accumulate
 from typing import List
 from core.data_models import PerformanceReport, DailyStats
+from config import TradingConfig
 
 
+def _sell_pnls(trades) -> List[float]:
+    """
+    提取所有卖出交易的实现盈亏（一次遍历，供各指标复用）
+    
+    参数:
+        trades: list - 交易记录（storage.load_trades() 的格式）
+    
+    返回:
+        List[float] - 按时间顺序的实现盈亏列表
+    """
+    pnls = []
+    for trade in trades:
+        pnl = trade.get('performance', {}).get('realized_pnl')
+        if pnl is not None:
+            pnls.append(pnl)
+    return pnls
 
 
 class PerformanceAnalyzer:
@@ -40,19 +59,151 @@ class PerformanceAnalyzer:
         返回:
             PerformanceReport - 性能报告
         """
-        pass
+        trades = self.storage.load_trades()
+        
+        # 一次遍历交易记录：买卖计数、实现盈亏、盈亏百分比、时间范围
+        buy_trades = 0
+        sell_trades = 0
+        pnls = []
+        profit_percents = []
+        loss_percents = []
+        timestamps = []
+        for trade in trades:
+            basic_info = trade.get('basic_info')
+            if basic_info is not None:
+                action = basic_info.get('action')
+                if action == 'BUY':
+                    buy_trades += 1
+                elif action == 'SELL':
+                    sell_trades += 1
+                timestamps.append(basic_info['timestamp'])
+            
+            perf = trade.get('performance', {})
+            pnl = perf.get('realized_pnl')
+            if pnl is None:
+                continue
+            pnls.append(pnl)
+            pnl_percent = perf.get('pnl_percent')
+            if pnl_percent is not None:
+                (profit_percents if pnl > 0 else loss_percents).append(pnl_percent * 100)
+        
+        # 盈亏拆分
+        profits = [p for p in pnls if p > 0]
+        losses = [p for p in pnls if p <= 0]
+        realized_pnl = sum(pnls)
+        
+        # 资产状态
+        metadata = self.storage.load_session_metadata() or {}
+        initial_balance = metadata.get('initial_balance', TradingConfig.INITIAL_BALANCE)
+        current_balance = self.storage.load_balance()
+        positions = self.storage.load_positions()
+        position_value = sum(p['amount'] * p['current_price'] for p in positions.values())
+        unrealized_pnl = sum(p['unrealized_pnl'] for p in positions.values())
+        total_value = current_balance + position_value
+        
+        max_drawdown, max_drawdown_percent = self._max_drawdown(pnls, initial_balance)
+        
+        return PerformanceReport(
+            total_trades=len(trades),
+            buy_trades=buy_trades,
+            sell_trades=sell_trades,
+            winning_trades=len(profits),
+            losing_trades=len(losses),
+            win_rate=self._win_rate(pnls) * 100,
+            total_pnl=realized_pnl + unrealized_pnl,
+            realized_pnl=realized_pnl,
+            unrealized_pnl=unrealized_pnl,
+            avg_profit=sum(profits) / len(profits) if profits else 0.0,
+            avg_loss=sum(losses) / len(losses) if losses else 0.0,
+            avg_profit_percent=sum(profit_percents) / len(profit_percents) if profit_percents else 0.0,
+            avg_loss_percent=sum(loss_percents) / len(loss_percents) if loss_percents else 0.0,
+            profit_factor=self._profit_factor(pnls),
+            max_drawdown=max_drawdown,
+            max_drawdown_percent=max_drawdown_percent,
+            initial_balance=initial_balance,
+            current_balance=current_balance,
+            position_value=position_value,
+            total_value=total_value,
+            total_return=(total_value - initial_balance) / initial_balance * 100 if initial_balance > 0 else 0.0,
+            start_time=min(timestamps) if timestamps else metadata.get('created_timestamp', 0),
+            end_time=max(timestamps) if timestamps else int(time.time()),
+            current_positions=len(positions)
+        )
     
     def calculate_win_rate(self, trades):
-        """计算胜率"""
-        pass
+        """
+        计算胜率
+        
+        返回:
+            float - 胜率（0~1），无卖出交易时为0
+        """
+        return self._win_rate(_sell_pnls(trades))
     
     def calculate_profit_factor(self, trades):
-        """计算盈亏比"""
-        pass
+        """
+        计算盈亏比（总盈利 / 总亏损）
+        
+        返回:
+            float - 盈亏比；没有亏损时返回 inf（无盈利时为0）
+        """
+        return self._profit_factor(_sell_pnls(trades))
     
-    def calculate_max_drawdown(self, trades):
-        """计算最大回撤"""
-        pass
+    def calculate_max_drawdown(self, trades, initial_balance: float = None):
+        """
+        计算最大回撤（基于已实现盈亏的权益曲线）
+        
+        参数:
+            trades: list - 交易记录
+            initial_balance: float - 权益曲线起点（默认取会话元数据，没有元数据时用配置值）
+        
+        返回:
+            tuple - (最大回撤USD（负数或0）, 最大回撤百分比（负数或0）)
+        """
+        if initial_balance is None:
+            metadata = self.storage.load_session_metadata() or {}
+            initial_balance = metadata.get('initial_balance', TradingConfig.INITIAL_BALANCE)
+        return self._max_drawdown(_sell_pnls(trades), initial_balance)
+    
+    @staticmethod
+    def _win_rate(pnls: List[float]) -> float:
+        """由实现盈亏列表计算胜率（0~1）"""
+        if not pnls:
+            return 0.0
+        return sum(1 for p in pnls if p > 0) / len(pnls)
+    
+    @staticmethod
+    def _profit_factor(pnls: List[float]) -> float:
+        """由实现盈亏列表计算盈亏比"""
+        gross_profit = 0.0
+        gross_loss = 0.0
+        for p in pnls:
+            if p > 0:
+                gross_profit += p
+            else:
+                gross_loss -= p
+        
+        if gross_loss == 0:
+            return float('inf') if gross_profit > 0 else 0.0
+        return gross_profit / gross_loss
+    
+    @staticmethod
+    def _max_drawdown(pnls: List[float], initial_balance: float) -> tuple:
+        """由实现盈亏列表和初始余额计算最大回撤（USD, 百分比）"""
+        equity = accumulate(pnls, initial=initial_balance)
+        
+        peak = initial_balance
+        max_drawdown = 0.0
+        max_drawdown_percent = 0.0
+        for value in equity:
+            if value > peak:
+                peak = value
+                continue
+            drawdown = value - peak
+            if drawdown < max_drawdown:
+                max_drawdown = drawdown
+                max_drawdown_percent = drawdown / peak * 100 if peak > 0 else 0.0
+        
+        return max_drawdown, max_drawdown_percent
     
     def generate_daily_report(self):
         """生成每日报告"""
@@ -18,20 +18,55 @@
 ❌ 请勿在新代码中引用此文件
 ============================================================
 """
+import atexit
 import json
 import os
 import random
-from datetime import datetime
+import time
+from array import array
+from collections import deque
 from config import Config  # 引入配置
 from utils.logger import logger
 
+# 滑点区间在导入时读取一次（Config 中已是小数形式，0.005 即 0.5%）
+# 滑点 = random() * 区间宽度 + 下限
+_SLIP_SCALE = Config.SLIPPAGE_MAX - Config.SLIPPAGE_MIN
+_SLIP_OFFSET = Config.SLIPPAGE_MIN
+_random = random.random
+
+# 账本落盘的最小间隔（秒），突发信号时合并多次写入
+_FLUSH_INTERVAL = 1.0
+
+# 内存中保留的最大交易记录数（长时间运行时限制内存和账本体积）
+_MAX_HISTORY = 10_000
+
+
 class VirtualTrader:
+    __slots__ = (
+        'file_path', 'history_path', 'balance', 'trade_history', '_dirty', '_last_flush',
+        '_pending_history', '_history_lines',
+        '_mint_ids', '_symbols', '_amount', '_cost',
+    )
+
     def __init__(self):
-        self.file_path = os.path.join("database", "paper_trading.json")
+        self.file_path = os.path.join("database", "paper_trading.json")  # 余额+持仓（小文件，整体重写）
+        self.history_path = os.path.join("database", "paper_trading_history.jsonl")  # 交易记录（只追加）
         self.balance = 1000.0  # 初始虚拟资金 (USD)
-        self.positions = {}    
-        self.trade_history = []
+        
+        # 持仓按列存储（SoA）：mint -> 下标，各字段存于并行数组
+        # 回测涉及大量代币时比 dict-of-objects 省内存，汇总计算也只需遍历两列
+        self._mint_ids = {}
+        self._symbols = []
+        self._amount = array('d')
+        self._cost = array('d')
+        
+        self.trade_history = deque(maxlen=_MAX_HISTORY)
+        self._pending_history = []  # 尚未追加到 history_path 的交易记录
+        self._history_lines = 0     # history_path 当前行数（用于判断是否需要压缩）
+        self._dirty = False  # 内存状态是否有未落盘的变更
+        self._last_flush = 0.0
         self._load_data()
+        atexit.register(self._flush)  # 退出时保证最后一批交易落盘
 
     def on_signal(self, signal, sol_price_usd):
         """接收信号并执行虚拟交易"""
@@ -40,18 +75,41 @@ class VirtualTrader:
         elif signal.type == "SELL":
             self._execute_sell(signal, sol_price_usd)
         
+        self._maybe_flush()
+
+    def _maybe_flush(self):
+        """距离上次落盘超过 _FLUSH_INTERVAL 才写文件"""
+        if self._dirty and time.monotonic() - self._last_flush > _FLUSH_INTERVAL:
+            self._flush()
+
+    def _flush(self):
+        """立即把未落盘的变更写入文件"""
         self._save_data()
+        self._last_flush = time.monotonic()
+
+    def _intern(self, mint, symbol):
+        """返回 mint 对应的数组下标，首次出现时分配新槽位"""
+        i = self._mint_ids.get(mint)
+        if i is None:
+            i = self._mint_ids[mint] = len(self._symbols)
+            self._symbols.append(symbol)
+            self._amount.append(0.0)
+            self._cost.append(0.0)
+        return i
+
+    @property
+    def positions(self):
+        """当前持仓视图 {mint: {'symbol', 'amount', 'cost_basis'}}（仅含数量>0的代币）"""
+        amount, cost, symbols = self._amount, self._cost, self._symbols
+        return {
+            mint: {"symbol": symbols[i], "amount": amount[i], "cost_basis": cost[i]}
+            for mint, i in self._mint_ids.items()
+            if amount[i] > 0
+        }
 
     def _get_random_slippage(self):
-        """生成随机滑点"""
-        # 1. 从配置里取整数，比如 10 到 100 之间的一个数 (例如随机到了 50)
-        bps_int = random.uniform(Config.SLIPPAGE_MIN_BPS, Config.SLIPPAGE_MAX_BPS)
-        
-        # 2. 【关键定义在这里】将整数转换为百分比小数
-        # 50 / 10000 = 0.005 (即 0.5%)
-        slippage_decimal = bps_int / 10000.0 
-        
-        return slippage_decimal
+        """生成随机滑点（小数形式，0.005 即 0.5%）"""
+        return _random() * _SLIP_SCALE + _SLIP_OFFSET
 
     def _execute_buy(self, signal, sol_price):
         # 1. 理论成本
@@ -72,36 +130,32 @@ class VirtualTrader:
         self.balance -= actual_cost_usd
         
         # 更新持仓数据
-        mint = signal.token_mint
-        if mint not in self.positions:
-            self.positions[mint] = {'symbol': signal.token_symbol, 'amount': 0.0, 'cost_basis': 0.0}
+        i = self._intern(signal.token_mint, signal.token_symbol)
         
-        current_amt = self.positions[mint]['amount']
-        current_cost = self.positions[mint]['cost_basis']
-        
-        new_amt = current_amt + signal.token_amount
-        total_spent = (current_amt * current_cost) + actual_cost_usd
-        new_avg_price = total_spent / new_amt if new_amt > 0 else 0
+        new_amt = self._amount[i] + signal.token_amount
+        total_spent = (self._amount[i] * self._cost[i]) + actual_cost_usd
 
-        self.positions[mint]['amount'] = new_amt
-        self.positions[mint]['cost_basis'] = new_avg_price
+        self._amount[i] = new_amt
+        self._cost[i] = total_spent / new_amt if new_amt > 0 else 0
 
-        print(f"📈 [虚拟买入] {signal.token_symbol}")
-        print(f"   ├─ 数量: {signal.token_amount:,.2f}")
-        print(f"   ├─ SOL价: ${sol_price:.2f}")
-        print(f"   ├─ 滑点: {slippage*100:.3f}% (额外损耗 ${slippage_cost:.4f})")
-        print(f"   └─ 总花费: ${actual_cost_usd:.2f}")
+        # 合并为一条日志输出，避免多次 print 逐行刷新 stdout
+        logger.info(
+            f"📈 [虚拟买入] {signal.token_symbol}\n"
+            f"   ├─ 数量: {signal.token_amount:,.2f}\n"
+            f"   ├─ SOL价: ${sol_price:.2f}\n"
+            f"   ├─ 滑点: {slippage*100:.3f}% (额外损耗 ${slippage_cost:.4f})\n"
+            f"   └─ 总花费: ${actual_cost_usd:.2f}"
+        )
         
         self._log_trade("BUY", signal, actual_cost_usd, 0, slippage)
 
     def _execute_sell(self, signal, sol_price):
-        mint = signal.token_mint
-        if mint not in self.positions or self.positions[mint]['amount'] <= 0:
-            print(f"⚠️ [虚拟卖出] 无法卖出 {signal.token_symbol}: 无持仓")
+        i = self._mint_ids.get(signal.token_mint)
+        if i is None or self._amount[i] <= 0:
+            logger.warning(f"⚠️ [虚拟卖出] 无法卖出 {signal.token_symbol}: 无持仓")
             return
 
-        holding = self.positions[mint]
-        sell_amt = min(signal.token_amount, holding['amount'])
+        sell_amt = min(signal.token_amount, self._amount[i])
         
         # 1. 理论收入
         base_revenue_usd = signal.sol_amount * sol_price
@@ -113,27 +167,31 @@ class VirtualTrader:
         # 实际收入 = 理论收入 * (1 - 0.005)
         actual_revenue_usd = base_revenue_usd * (1 - slippage)
         
-        cost_of_sold_tokens = sell_amt * holding['cost_basis']
+        cost_of_sold_tokens = sell_amt * self._cost[i]
         profit_usd = actual_revenue_usd - cost_of_sold_tokens
         
         self.balance += actual_revenue_usd
-        holding['amount'] -= sell_amt
+        self._amount[i] -= sell_amt
         
-        if holding['amount'] <= 0:
-            del self.positions[mint]
+        # 清仓：槽位保留复用，数量与成本归零
+        if self._amount[i] <= 0:
+            self._amount[i] = 0.0
+            self._cost[i] = 0.0
 
         emoji = "🟢 止盈" if profit_usd > 0 else "🔴 止损"
-        print(f"{emoji} [虚拟卖出] {signal.token_symbol}")
-        print(f"   ├─ 数量: {sell_amt:,.2f}")
-        print(f"   ├─ 滑点: {slippage*100:.3f}%")
-        print(f"   ├─ 到手: ${actual_revenue_usd:.2f}")
-        print(f"   └─ 净利: ${profit_usd:+.2f} (余额: ${self.balance:.2f})")
+        logger.info(
+            f"{emoji} [虚拟卖出] {signal.token_symbol}\n"
+            f"   ├─ 数量: {sell_amt:,.2f}\n"
+            f"   ├─ 滑点: {slippage*100:.3f}%\n"
+            f"   ├─ 到手: ${actual_revenue_usd:.2f}\n"
+            f"   └─ 净利: ${profit_usd:+.2f} (余额: ${self.balance:.2f})"
+        )
         
         self._log_trade("SELL", signal, actual_revenue_usd, profit_usd, slippage)
 
     def _log_trade(self, type, signal, value_usd, pnl, slippage):
         record = {
-            "time": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+            "ts": time.time(),  # Unix 时间戳（旧账本中的记录仍是 "time" 字符串字段）
             "type": type,
             "symbol": signal.token_symbol,
             "amount": signal.token_amount,
@@ -143,6 +201,8 @@ class VirtualTrader:
             "balance_after": self.balance
         }
         self.trade_history.append(record)
+        self._pending_history.append(record)
+        self._dirty = True
 
     def _load_data(self):
         if os.path.exists(self.file_path):
@@ -150,16 +210,60 @@ class VirtualTrader:
                 with open(self.file_path, 'r') as f:
                     data = json.load(f)
                     self.balance = data.get('balance', 1000.0)
-                    self.positions = data.get('positions', {})
-                    self.trade_history = data.get('history', [])
+                    for mint, item in data.get('positions', {}).items():
+                        i = self._intern(mint, item.get('symbol', ''))
+                        self._amount[i] = item.get('amount', 0.0)
+                        self._cost[i] = item.get('cost_basis', 0.0)
+                    # 旧版账本把交易记录存在同一文件里：迁移到 JSONL
+                    legacy_history = data.get('history')
+                    if legacy_history and not os.path.exists(self.history_path):
+                        self._pending_history.extend(legacy_history)
+                        self._dirty = True
             except:
                 print("⚠️ 读取虚拟账本失败，重置数据")
+        
+        history = list(self._pending_history)
+        if os.path.exists(self.history_path):
+            try:
+                with open(self.history_path, 'r') as f:
+                    for line in f:
+                        if line.strip():
+                            history.append(json.loads(line))
+                self._history_lines = len(history)
+            except:
+                print("⚠️ 读取交易记录失败，仅保留已读取部分")
+        self.trade_history = deque(history, maxlen=_MAX_HISTORY)
 
     def _save_data(self):
+        """保存账本（无变更时跳过；先写临时文件再原子替换，避免写一半时崩溃损坏账本）"""
+        if not self._dirty:
+            return
+        
+        # 1. 新增交易记录只追加，IO 量与历史长度无关
+        if self._pending_history:
+            with open(self.history_path, 'a') as f:
+                f.write("".join(json.dumps(r) + "\n" for r in self._pending_history))
+            self._history_lines += len(self._pending_history)
+            self._pending_history.clear()
+            
+            if self._history_lines > 2 * _MAX_HISTORY:
+                self._compact_history()
+        
+        # 2. 余额和持仓体积很小，整体重写
         data = {
             "balance": self.balance,
-            "positions": self.positions,
-            "history": self.trade_history
+            "positions": self.positions
         }
-        with open(self.file_path, 'w') as f:
+        tmp_path = self.file_path + ".tmp"
+        with open(tmp_path, 'w') as f:
             json.dump(data, f, indent=2)
+        os.replace(tmp_path, self.file_path)
+        self._dirty = False
+
+    def _compact_history(self):
+        """压缩交易记录文件：只保留内存中最近的 _MAX_HISTORY 条"""
+        tmp_path = self.history_path + ".tmp"
+        with open(tmp_path, 'w') as f:
+            f.write("".join(json.dumps(r) + "\n" for r in self.trade_history))
+        os.replace(tmp_path, self.history_path)
+        self._history_lines = len(self.trade_history)
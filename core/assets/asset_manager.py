@@ -1,4 +1,5 @@
 import logging
+import os
 from storage.json_storage import JsonStorage
 
 logger = logging.getLogger(__name__)
@@ -8,16 +9,31 @@ class AssetManager:
     资产管理器
     职责：协调 Monitor 和 Storage，维护内存中的资产状态
     """
+    __slots__ = ('monitor', 'storage', 'local_assets', 'total_value', '_cache_key', '_summary_cache')
+
     def __init__(self, monitor):
         self.monitor = monitor
         self.storage = JsonStorage(monitor.target_wallet)
         self.local_assets = []
         self.total_value = 0.0
+        self._cache_key = None  # (文件路径, mtime_ns)，文件未变时复用内存数据
+        self._summary_cache = None  # get_summary_data 的结果，资产变更时置空
 
     def load_local(self):
-        """加载本地缓存"""
+        """加载本地缓存（文件修改时间未变时直接返回内存数据）"""
+        path = self.storage.assets_file
+        try:
+            cache_key = (path, os.stat(path).st_mtime_ns)
+        except OSError:
+            cache_key = None
+        
+        if cache_key is not None and cache_key == self._cache_key:
+            return self.local_assets, self.total_value
+        
         # load_assets 返回的就是处理好的扁平数据
         self.local_assets, self.total_value = self.storage.load_assets()
+        self._cache_key = cache_key
+        self._summary_cache = None
         return self.local_assets, self.total_value
 
     def update_from_chain(self, force=False):
@@ -43,6 +59,8 @@ class AssetManager:
             # 3. 更新内存状态为【处理后的数据】
             self.local_assets = processed_assets
             self.total_value = total_value
+            self._cache_key = None  # 文件已被改写，下次 load_local 重新读取
+            self._summary_cache = None
             
             return True
 
@@ -50,6 +68,37 @@ class AssetManager:
             logger.error(f"资产更新失败: {e}", exc_info=True)
             return False
 
+    def update_prices_only(self):
+        """
+        只刷新已有资产的价格（不重拉余额、不改写资产文件）
+        
+        返回:
+            bool: 是否更新成功
+        """
+        if not self.local_assets:
+            return False
+        
+        prices = self.monitor.get_token_prices([a['mint'] for a in self.local_assets])
+        if prices is None:
+            logger.warning("价格查询失败，保留旧价格")
+            return False
+        
+        # 生成新字典而不是原地修改，已发布给读者的快照不受影响
+        updated = []
+        total_value = 0.0
+        for asset in self.local_assets:
+            price = prices.get(asset['mint'])
+            if price is not None:
+                asset = {**asset, 'price_per_token': price, 'value_usd': asset['balance'] * price}
+            updated.append(asset)
+            total_value += asset['value_usd']
+        
+        updated.sort(key=lambda x: x['value_usd'], reverse=True)
+        self.local_assets = updated
+        self.total_value = total_value
+        self._summary_cache = None
+        return True
+
     # 删除：print_summary() 方法
     # def print_summary(self):
     #     """打印资产详情表格"""
@@ -60,16 +109,20 @@ class AssetManager:
         """
         获取资产摘要数据（不打印）
         
+        资产未变化时返回同一个缓存字典，调用方不应修改它
+        
         返回:
             dict: {
                 'assets': list,      # 资产列表
                 'total_value': float # 总价值
             }
         """
-        return {
-            'assets': self.local_assets,
-            'total_value': self.total_value
-        }
+        if self._summary_cache is None:
+            self._summary_cache = {
+                'assets': self.local_assets,
+                'total_value': self.total_value
+            }
+        return self._summary_cache
 
     def get_total_value(self):
         return self.total_value
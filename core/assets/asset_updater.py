@@ -22,6 +22,9 @@ from config import Config
 
 logger = logging.getLogger(__name__)
 
+# 初始化重试的最大退避时间（秒）
+_MAX_RETRY_DELAY = 30
+
 
 class AssetUpdater(threading.Thread):
     """
@@ -33,15 +36,25 @@ class AssetUpdater(threading.Thread):
     - 定期刷新（防止价格过期）
     - 线程安全的资产管理
     """
+    __slots__ = (
+        'assets', 'presenter', 'update_queue',
+        'shutdown', 'initialized',
+        'last_update_time', 'update_interval', 'lock',
+        '_snapshot',
+    )
     
-    def __init__(self, asset_manager, presenter, update_queue):
+    def __init__(self, asset_manager, presenter, update_queue, shutdown=None):
         """
         初始化资产更新线程
         
         参数:
             asset_manager: AssetManager 实例
             presenter: ConsolePresenter 实例
-            update_queue: 接收更新通知的队列
+            update_queue: 接收更新通知的队列（SPSCQueue）
+            shutdown: threading.Event - 全局停止事件（可选，不传则自建）
+        
+        注意：本线程必须是 update_queue 唯一的消费者（get / drain_nowait 只在 run 中调用），
+        SPSCQueue 依赖单消费者才能免锁出队
         """
         super().__init__()
         self.name = "AssetUpdater"
@@ -52,19 +65,27 @@ class AssetUpdater(threading.Thread):
         self.presenter = presenter
         self.update_queue = update_queue
         
-        # 控制标志
-        self.running = True
+        # 控制标志（停止事件可被多个线程共享）
+        self.shutdown = shutdown if shutdown is not None else threading.Event()
         self.initialized = False
         
         # 更新控制
-        self.last_update_time = 0
+        self.last_update_time = float("-inf")  # monotonic 时钟，初始视为"很久以前"
         self.update_interval = 30  # 最小更新间隔（秒）
         
-        # 线程安全锁
+        # 线程安全锁（只用于串行化写入：update_from_chain / save_assets）
         self.lock = threading.Lock()
         
+        # 只读快照 (total_value, assets_tuple)，读者直接读取该属性，无需加锁
+        self._snapshot = (0.0, ())
+        
         logger.info("✅ 资产更新线程初始化完成")
     
+    @property
+    def running(self) -> bool:
+        """线程是否仍在运行（停止事件未置位）"""
+        return not self.shutdown.is_set()
+    
     def initialize(self):
         """
         初始化资产数据
@@ -77,30 +98,39 @@ class AssetUpdater(threading.Thread):
         
         with self.lock:
             self.assets.load_local()
+            self._publish_snapshot()
         
         # 增加重试逻辑
         logger.info("🔄 正在初始化链上资产数据...")
         success = False
+        max_retries = Config.ASSET_SYNC_MAX_RETRIES
+        retry_delay = Config.ASSET_SYNC_RETRY_DELAY
         
-        for i in range(Config.ASSET_SYNC_MAX_RETRIES):
-            with self.lock:
-                if self.assets.update_from_chain():
-                    success = True
-                    logger.info("✅ 资产同步完成")
-                    break
+        for i in range(max_retries):
+            # 网络请求不持锁：初始化阶段其他线程尚未启动，
+            # update_from_chain 内部整体替换 local_assets，不会暴露半成品
+            if self.assets.update_from_chain():
+                success = True
+                logger.info("✅ 资产同步完成")
+                break
             
+            if i == max_retries - 1:
+                break
+            
+            # 指数退避：2s, 4s, 8s ... 最长 _MAX_RETRY_DELAY
+            delay = min(retry_delay * (1 << i), _MAX_RETRY_DELAY)
             logger.warning(
-                f"⚠️ 第 {i+1}/{Config.ASSET_SYNC_MAX_RETRIES} 次资产同步失败，"
-                f"{Config.ASSET_SYNC_RETRY_DELAY}秒后重试..."
+                f"⚠️ 第 {i+1}/{max_retries} 次资产同步失败，"
+                f"{delay}秒后重试..."
             )
-            time.sleep(Config.ASSET_SYNC_RETRY_DELAY)
+            time.sleep(delay)
         
         if success:
             with self.lock:
-                summary = self.assets.get_summary_data()
+                total_value, assets = self._publish_snapshot()
             
-            self.presenter.show_assets(summary['assets'], summary['total_value'])
-            self.last_update_time = time.time()
+            self.presenter.show_assets(list(assets), total_value)
+            self.last_update_time = time.monotonic()
         else:
             logger.error("❌ 经过多次尝试，无法获取链上资产数据。")
             logger.error("⚠️ 资产更新线程将继续运行，但初始数据不可用。")
@@ -119,7 +149,7 @@ class AssetUpdater(threading.Thread):
         """
         # 等待初始化
         while not self.initialized and self.running:
-            time.sleep(0.1)
+            self.shutdown.wait(0.1)
         
         if not self.running:
             return
@@ -127,21 +157,31 @@ class AssetUpdater(threading.Thread):
         # 主循环
         while self.running:
             try:
-                # 检查更新队列（非阻塞，超时1秒）
+                # 阻塞等待通知（无交易时每 update_interval 秒才唤醒一次）
                 try:
-                    msg = self.update_queue.get(timeout=1.0)
-                    
-                    if msg['type'] == 'transaction_update':
-                        logger.debug(f"📬 收到交易更新通知")
-                        self._handle_transaction_update(msg)
-                    
+                    msg = self.update_queue.get(timeout=self.update_interval)
                 except Empty:
+                    if not self.running:
+                        break
                     # 队列为空，检查是否需要定期刷新
                     self._check_periodic_refresh()
+                    continue
+                
+                # 突发模式：一次性取空队列，多条通知合并为一次更新
+                pending = [msg]
+                pending.extend(self.update_queue.drain_nowait())
+                
+                if not self.running:
+                    break
+                
+                updates = [m for m in pending if m['type'] == 'transaction_update']
+                if updates:
+                    logger.debug(f"📬 收到 {len(updates)} 条交易更新通知（合并为一次更新）")
+                    self._handle_transaction_update(updates[-1])
                 
             except Exception as e:
                 logger.error(f"💥 资产更新线程崩溃: {e}", exc_info=True)
-                time.sleep(5)
+                self.shutdown.wait(5)
     
     def _handle_transaction_update(self, msg):
         """
@@ -154,7 +194,7 @@ class AssetUpdater(threading.Thread):
                 - count: 交易数量
         """
         # 检查是否需要限流（避免频繁更新）
-        current_time = time.time()
+        current_time = time.monotonic()
         time_since_last = current_time - self.last_update_time
         
         if time_since_last < self.update_interval:
@@ -168,13 +208,16 @@ class AssetUpdater(threading.Thread):
         logger.info(f"🔄 交易触发资产更新...")
         
         with self.lock:
-            if self.assets.update_from_chain():
-                summary = self.assets.get_summary_data()
-                self.presenter.show_assets(summary['assets'], summary['total_value'])
-                self.last_update_time = current_time
-                logger.debug("✅ 资产更新完成")
-            else:
-                logger.warning("⚠️ 资产更新失败")
+            updated = self.assets.update_from_chain()
+            if updated:
+                total_value, assets = self._publish_snapshot()
+        
+        if updated:
+            self.presenter.show_assets(list(assets), total_value)
+            self.last_update_time = current_time
+            logger.debug("✅ 资产更新完成")
+        else:
+            logger.warning("⚠️ 资产更新失败")
     
     def _check_periodic_refresh(self):
         """
@@ -182,7 +225,7 @@ class AssetUpdater(threading.Thread):
         
         - 每60秒刷新一次（防止价格过期）
         """
-        current_time = time.time()
+        current_time = time.monotonic()
         time_since_last = current_time - self.last_update_time
         
         # 每60秒刷新一次
@@ -191,32 +234,61 @@ class AssetUpdater(threading.Thread):
             
             with self.lock:
                 if self.assets.update_from_chain():
-                    summary = self.assets.get_summary_data()
                     # 定期刷新不显示资产表格，只更新数据
+                    self._publish_snapshot()
                     self.last_update_time = current_time
                     logger.debug("✅ 定期刷新完成")
     
+    def update_prices(self):
+        """
+        只刷新资产价格（供 PriceUpdater 调用，与链上同步共用写锁）
+        
+        返回:
+            bool: 是否更新成功
+        """
+        with self.lock:
+            if not self.assets.update_prices_only():
+                return False
+            self._publish_snapshot()
+        return True
+    
+    def _publish_snapshot(self):
+        """
+        发布资产只读快照（调用方需持有 self.lock）
+        
+        返回:
+            tuple: (总资产价值, 资产元组)
+        """
+        summary = self.assets.get_summary_data()
+        self._snapshot = (summary['total_value'], tuple(summary['assets']))
+        return self._snapshot
+    
     def get_total_value(self):
         """
-        获取总资产价值（线程安全）
+        获取总资产价值（读取快照，无需加锁）
         
         返回:
             float: 总资产价值
         """
-        with self.lock:
-            return self.assets.get_total_value()
+        return self._snapshot[0]
     
     def get_summary(self):
         """
-        获取资产摘要（线程安全）
+        获取资产摘要（读取快照，无需加锁）
         
         返回:
             dict: 资产摘要数据
         """
-        with self.lock:
-            return self.assets.get_summary_data()
+        total_value, assets = self._snapshot
+        return {
+            'assets': list(assets),
+            'total_value': total_value
+        }
     
     def stop(self):
         """优雅停止线程"""
         logger.info("🛑 正在停止资产更新线程...")
-        self.running = False
+        self.shutdown.set()
+        # 关闭队列以唤醒阻塞的主循环，使其立即退出
+        # （不往队列里放停止消息，交易追踪线程始终是唯一的生产者）
+        self.update_queue.close()
@@ -14,7 +14,6 @@
 import threading
 import time
 import logging
-from datetime import datetime
 
 from utils.cost_tracker import tracker
 
@@ -30,14 +29,21 @@ class PriceUpdater(threading.Thread):
     - 不阻塞交易追踪和资产更新
     - 可配置更新频率
     """
+    __slots__ = (
+        'assets', 'presenter', 'asset_updater',
+        'shutdown', 'initialized',
+        'update_interval', 'lock',
+    )
     
-    def __init__(self, asset_manager, presenter):
+    def __init__(self, asset_manager, presenter, asset_updater=None, shutdown=None):
         """
         初始化价格更新线程
         
         参数:
             asset_manager: AssetManager 实例
             presenter: ConsolePresenter 实例
+            asset_updater: AssetUpdater 实例（可选，传入时共用其写锁并刷新其快照）
+            shutdown: threading.Event - 全局停止事件（可选，不传则自建）
         """
         super().__init__()
         self.name = "PriceUpdater"
@@ -46,9 +52,10 @@ class PriceUpdater(threading.Thread):
         # 核心组件
         self.assets = asset_manager
         self.presenter = presenter
+        self.asset_updater = asset_updater
         
-        # 控制标志
-        self.running = True
+        # 控制标志（停止事件可被多个线程共享）
+        self.shutdown = shutdown if shutdown is not None else threading.Event()
         self.initialized = False
         
         # 更新频率（秒）
@@ -59,6 +66,11 @@ class PriceUpdater(threading.Thread):
         
         logger.info("✅ 价格更新线程初始化完成")
     
+    @property
+    def running(self) -> bool:
+        """线程是否仍在运行（停止事件未置位）"""
+        return not self.shutdown.is_set()
+    
     def run(self):
         """
         主循环（线程入口）
@@ -71,11 +83,15 @@ class PriceUpdater(threading.Thread):
         # 等待初始化（等待资产管理器就绪）
         self.initialized = True
         
+        # 下次更新的截止时间（monotonic 时钟，不受系统时间调整影响）
+        next_run = time.monotonic() + self.update_interval
+        
         # 主循环
         while self.running:
             try:
-                # 等待更新间隔
-                time.sleep(self.update_interval)
+                # 等待到截止时间（扣除上一轮更新耗时，避免周期漂移）
+                self.shutdown.wait(max(0.0, next_run - time.monotonic()))
+                next_run += self.update_interval
                 
                 if not self.running:
                     break
@@ -85,7 +101,7 @@ class PriceUpdater(threading.Thread):
                 
             except Exception as e:
                 logger.error(f"💥 价格更新线程崩溃: {e}", exc_info=True)
-                time.sleep(5)
+                self.shutdown.wait(5)
     
     def _update_prices(self):
         """
@@ -94,34 +110,30 @@ class PriceUpdater(threading.Thread):
         - 从链上获取最新价格
         - 显示更新状态
         """
-        current_time = datetime.now().strftime("%H:%M:%S")
-        
         logger.debug(f"💱 更新价格...")
         
-        # 注意：这里简化处理
-        # 实际上 update_from_chain() 会同时更新资产和价格
-        # 如果需要只更新价格，需要在 AssetManager 中添加单独方法
+        # 只刷新价格，余额仍由 AssetUpdater 的链上同步负责
+        if self.asset_updater is not None:
+            success = self.asset_updater.update_prices()
+        else:
+            with self.lock:
+                success = self.assets.update_prices_only()
         
-        # 为了避免与 AssetUpdater 冲突，这里只显示状态
-        # 不实际调用更新（实际更新由 AssetUpdater 负责）
-        
-        logger.debug(f"💱 价格更新完成")
+        if success:
+            logger.debug(f"💱 价格更新完成")
+        else:
+            logger.debug(f"⚠️ 价格更新失败，等待下一轮")
     
     def stop(self):
         """优雅停止线程"""
         logger.info("🛑 正在停止价格更新线程...")
-        self.running = False
+        self.shutdown.set()
 
 
 # 注意：
-# 当前实现中，价格更新和资产更新是耦合的（都调用 update_from_chain）
-# 为了避免冲突和重复调用，PriceUpdater 当前只是占位
-# 未来可以优化 AssetManager，分离价格更新和资产更新逻辑
-# 
-# 临时方案：
-# - AssetUpdater 负责完整更新（资产+价格）
-# - PriceUpdater 暂时禁用或只做监控
+# - AssetUpdater 负责完整更新（资产+价格，调用 update_from_chain）
+# - PriceUpdater 只刷新价格（调用 AssetManager.update_prices_only）
+# - 是否启动由 Config.ENABLE_PRICE_UPDATER 控制（默认关闭）
 # 
 # 未来优化：
-# - AssetManager.update_prices_only() - 只更新价格
 # - AssetManager.update_balances_only() - 只更新余额
@@ -10,10 +10,18 @@
 - 自动生成 __init__、__repr__ 等方法
 - 支持类型提示
 - 代码简洁清晰
+- slots=True：无 __dict__，更省内存、属性访问更快
+- frozen=True：创建后不可修改，需要变更时用 dataclasses.replace 生成新对象
+  （例外：Position 由 PositionManager 独占并频繁更新，不冻结，原地修改字段）
+
+只读的输出对象（RiskAction、PerformanceReport、DailyStats）使用 NamedTuple：
+- 底层是 C 实现的 tuple，比 slots dataclass 更省内存
+- 天然不可变，属性访问即元组下标读取
 """
 
+import time
 from dataclasses import dataclass
-from typing import Optional, List
+from typing import Optional, List, NamedTuple
 from enum import Enum
 
 
@@ -35,7 +43,7 @@ class RiskActionType(Enum):
 
 # ==================== 交易信号相关 ====================
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class TradeSignal:
     """
     交易信号（从SignalParser输出）
@@ -57,7 +65,7 @@ class TradeSignal:
 
 # ==================== 价格信息相关 ====================
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class PriceInfo:
     """
     价格信息（从PriceOracle输出）
@@ -79,7 +87,7 @@ class PriceInfo:
 
 # ==================== 交易决策相关 ====================
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class TradingDecision:
     """
     交易决策（从TradingStrategy输出）
@@ -101,7 +109,7 @@ class TradingDecision:
 
 # ==================== 交易执行相关 ====================
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class ExecutionResult:
     """
     交易执行结果（从VirtualExecutor输出）
@@ -131,9 +139,66 @@ class ExecutionResult:
     realized_pnl: Optional[float] = None  # 实现盈亏（卖出时）
 
 
+@dataclass(slots=True, frozen=True)
+class SignalResult:
+    """
+    信号处理结果（从TradingCoordinator输出）
+    
+    直接引用信号/决策/执行对象，需要序列化时再调用 to_dict()
+    """
+    success: bool              # 是否成功
+    stage: str                 # 处理阶段
+    reason: str                # 原因
+    signal: TradeSignal        # 交易信号
+    timestamp: int             # 处理时间戳
+    
+    # 可选字段
+    decision: Optional[TradingDecision] = None  # 策略决策
+    execution: Optional[ExecutionResult] = None  # 执行结果
+    
+    def to_dict(self) -> dict:
+        """转换为字典（日志/存储/接口输出用）"""
+        signal = self.signal
+        result = {
+            "success": self.success,
+            "stage": self.stage,
+            "reason": self.reason,
+            "signal": {
+                "action": signal.action,
+                "token_mint": signal.token_mint,
+                "token_symbol": signal.token_symbol,
+                "amount": signal.amount,
+                "timestamp": signal.timestamp
+            },
+            "timestamp": self.timestamp
+        }
+        
+        decision = self.decision
+        if decision:
+            result["decision"] = {
+                "should_trade": decision.should_trade,
+                "action": decision.action.value if hasattr(decision.action, 'value') else str(decision.action),
+                "amount": decision.amount,
+                "reason": decision.reason
+            }
+        
+        execution = self.execution
+        if execution:
+            result["execution"] = {
+                "success": execution.success,
+                "executed_price": execution.executed_price,
+                "executed_amount": execution.executed_amount,
+                "cost": execution.cost,
+                "balance_after": execution.balance_after,
+                "realized_pnl": execution.realized_pnl
+            }
+        
+        return result
+
+
 # ==================== 持仓相关 ====================
 
-@dataclass
+@dataclass(slots=True)
 class Position:
     """
     持仓信息（从PositionManager管理）
@@ -163,14 +228,16 @@ class Position:
     @property
     def holding_duration(self) -> int:
         """持仓时长（秒）"""
-        import time
         return int(time.time()) - self.entry_time
+    
+    def holding_duration_at(self, now: int) -> int:
+        """以给定时间戳计算持仓时长（秒），批量检查时复用同一个 now"""
+        return now - self.entry_time
 
 
 # ==================== 风控相关 ====================
 
-@dataclass
-class RiskAction:
+class RiskAction(NamedTuple):
     """
     风控动作（从RiskController输出）
     
@@ -191,8 +258,7 @@ class RiskAction:
 
 # ==================== 性能报告相关 ====================
 
-@dataclass
-class PerformanceReport:
+class PerformanceReport(NamedTuple):
     """
     性能报告（从PerformanceAnalyzer输出）
     
@@ -243,8 +309,7 @@ class PerformanceReport:
     current_positions: int     # 当前持仓数
 
 
-@dataclass
-class DailyStats:
+class DailyStats(NamedTuple):
     """
     每日统计（性能报告的子集）
     """
@@ -267,6 +332,7 @@ __all__ = [
     'PriceInfo',
     'TradingDecision',
     'ExecutionResult',
+    'SignalResult',
     
     # 持仓和风控
     'Position',
@@ -10,6 +10,9 @@
 
 import time
 import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
 from typing import Optional, Dict, List
 from core.data_models import PriceInfo
 from config import SystemConfig
@@ -19,6 +22,76 @@ from .sources import HeliusSource
 
 logger = logging.getLogger(__name__)
 
+# 价格缓存最大条目数
+_CACHE_MAXSIZE = 10_000
+
+_MISSING = object()
+
+
+class _TTLCache:
+    """
+    带过期时间的缓存（惰性过期）
+    
+    - 写入时记录到期时刻（monotonic 时钟），命中路径只有一次 dict 查找和一次比较
+    - 超过 maxsize 时淘汰最早写入的条目
+    - TTL 固定且重写会把 key 移到末尾，所以 dict 顺序即到期顺序，
+      批量清理只需从头部删到第一个未过期条目为止
+    - 多线程共享：所有修改操作在锁内完成；读路径不加锁也不修改 dict，
+      单次 dict.get 在 GIL 下是原子的，读多写少时读线程永不阻塞
+    """
+    __slots__ = ('maxsize', 'ttl', 'timer', '_data', '_lock')
+    
+    def __init__(self, maxsize: int, ttl: float, timer=time.monotonic):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.timer = timer
+        self._data = {}  # {key: (value, expires_at)}
+        self._lock = threading.Lock()
+    
+    def get(self, key, default=None):
+        """读取未过期的值（无锁；过期条目留给 purge 或覆盖写入清理）"""
+        entry = self._data.get(key)
+        if entry is None or self.timer() > entry[1]:
+            return default
+        return entry[0]
+    
+    def __contains__(self, key) -> bool:
+        return self.get(key, _MISSING) is not _MISSING
+    
+    def __setitem__(self, key, value):
+        data = self._data
+        with self._lock:
+            data.pop(key, None)  # 重新写入的 key 移到末尾
+            if len(data) >= self.maxsize:
+                del data[next(iter(data))]
+            data[key] = (value, self.timer() + self.ttl)
+    
+    def __len__(self) -> int:
+        return len(self._data)
+    
+    def purge(self) -> int:
+        """
+        批量删除所有已过期条目
+        
+        返回:
+            int - 删除的条目数
+        """
+        data = self._data
+        now = self.timer()
+        expired = []
+        with self._lock:
+            for key, (_, expires_at) in data.items():
+                if expires_at >= now:
+                    break
+                expired.append(key)
+            for key in expired:
+                del data[key]
+        return len(expired)
+    
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
 
 class PriceOracle:
     """
@@ -50,90 +123,112 @@ class PriceOracle:
                 try:
                     source_instance = source_map[source_name]()
                     self.sources.append(source_instance)
-                    logger.info(f"   ✅ 加载价格源: {source_name}")
+                    logger.info("   ✅ 加载价格源: %s", source_name)
                 except Exception as e:
-                    logger.error(f"   ❌ 加载价格源失败 [{source_name}]: {e}")
+                    logger.error("   ❌ 加载价格源失败 [%s]: %s", source_name, e)
             else:
-                logger.warning(f"   ⚠️ 未知的价格源: {source_name}")
+                logger.warning("   ⚠️ 未知的价格源: %s", source_name)
         
         if not self.sources:
             raise ValueError("❌ 没有可用的价格源，请检查配置")
         
         # 缓存
-        self.cache: Dict[str, tuple] = {}  # {mint: (PriceInfo, timestamp)}
         self.cache_ttl = SystemConfig.PRICE_CACHE_TTL
+        self.cache = _TTLCache(maxsize=_CACHE_MAXSIZE, ttl=self.cache_ttl)  # {mint: PriceInfo}
+        
+        # 负缓存：所有源都查不到价格的代币（死币/无流动性），短期内不再请求
+        self.negative_cache = _TTLCache(
+            maxsize=_CACHE_MAXSIZE,
+            ttl=SystemConfig.PRICE_NEGATIVE_CACHE_TTL
+        )  # {mint: True}
+        
+        # 批量查询线程池（网络 IO 密集，并发发起请求）
+        self._executor = ThreadPoolExecutor(
+            max_workers=SystemConfig.PRICE_BATCH_CONCURRENCY,
+            thread_name_prefix="PriceQuery"
+        )
         
         logger.info(
-            f"✅ 价格查询器初始化完成 "
-            f"[策略: {self.strategy}, 源数量: {len(self.sources)}]"
+            "✅ 价格查询器初始化完成 "
+            "[策略: %s, 源数量: %s]",
+            self.strategy, len(self.sources)
         )
     
-    def get_price(self, mint: str) -> Optional[PriceInfo]:
+    def get_price(self, mint: str, now: Optional[int] = None) -> Optional[PriceInfo]:
         """
         查询单个代币价格
         
         参数:
             mint: str - 代币地址
+            now: int - 当前时间戳（可选，写入 PriceInfo.timestamp）
         
         返回:
             PriceInfo - 价格信息，失败返回None
         
         流程：
-        1. 检查缓存
+        1. 检查缓存（含负缓存）
         2. 按优先级依次尝试各个价格源
         3. 更新缓存
         """
         # 检查缓存
-        if self._is_cached(mint):
-            cached_price, _ = self.cache[mint]
-            logger.debug(f"🔄 使用缓存价格: {mint[:8]}...")
+        cached_price = self.cache.get(mint)
+        if cached_price is not None:
+            logger.debug("🔄 使用缓存价格: %s...", mint[:8])
             return cached_price
         
+        if mint in self.negative_cache:
+            logger.debug("🚫 近期查询失败，跳过: %s...", mint[:8])
+            return None
+        
         # 根据策略查询
         if self.strategy == "single":
             # 单一源模式：只用第一个
             source = self.sources[0]
             try:
-                price_info = source.query(mint)
+                price_info = source.query(mint, now)
                 if price_info:
-                    self.cache[mint] = (price_info, int(time.time()))
+                    self.cache[mint] = price_info
                     logger.debug(
-                        f"💰 [{source.get_name()}] 查询成功: "
-                        f"{mint[:8]}... = ${price_info.price_usd:.6f}"
+                        "💰 [%s] 查询成功: "
+                        "%s... = $%.6f",
+                        source.name, mint[:8], price_info.price_usd
                     )
                     return price_info
             except Exception as e:
-                logger.error(f"❌ [{source.get_name()}] 查询异常: {e}")
+                logger.error("❌ [%s] 查询异常: %s", source.name, e)
             
-            logger.warning(f"❌ 价格查询失败: {mint[:8]}...")
+            self.negative_cache[mint] = True
+            logger.warning("❌ 价格查询失败: %s...", mint[:8])
             return None
 
         elif self.strategy == "fallback":
             # 失败切换模式：依次尝试
             for source in self.sources:
                 try:
-                    price_info = source.query(mint)
+                    price_info = source.query(mint, now)
                     
                     if price_info:
-                        self.cache[mint] = (price_info, int(time.time()))
+                        self.cache[mint] = price_info
                         logger.debug(
-                            f"💰 [{source.get_name()}] 查询成功: "
-                            f"{mint[:8]}... = ${price_info.price_usd:.6f}"
+                            "💰 [%s] 查询成功: "
+                            "%s... = $%.6f",
+                            source.name, mint[:8], price_info.price_usd
                         )
                         return price_info
                     else:
-                        logger.debug(f"⚠️ [{source.get_name()}] 查询失败，尝试下一个源...")
+                        logger.debug("⚠️ [%s] 查询失败，尝试下一个源...", source.name)
                         continue
                 
                 except Exception as e:
-                    logger.error(f"❌ [{source.get_name()}] 查询异常: {e}")
+                    logger.error("❌ [%s] 查询异常: %s", source.name, e)
                     continue
             
-            logger.warning(f"❌ 所有价格源都无法查询: {mint[:8]}...")
+            self.negative_cache[mint] = True
+            logger.warning("❌ 所有价格源都无法查询: %s...", mint[:8])
             return None
 
         else:
-            logger.error(f"❌ 未知的价格源策略: {self.strategy}")
+            logger.error("❌ 未知的价格源策略: %s", self.strategy)
             return None
     
     def get_batch_prices(self, mints: List[str]) -> Dict[str, PriceInfo]:
@@ -146,59 +241,102 @@ class PriceOracle:
         返回:
             dict - {mint: PriceInfo}
         """
+        now = int(time.time())  # 整批共用一个时间戳
         result = {}
         uncached_mints = []
         
         # 1. 先从缓存获取
         for mint in mints:
-            if self._is_cached(mint):
-                cached_price, _ = self.cache[mint]
+            cached_price = self.cache.get(mint)
+            if cached_price is not None:
                 result[mint] = cached_price
-            else:
+            elif mint not in self.negative_cache:
                 uncached_mints.append(mint)
         
         logger.debug(
-            f"📊 批量查询: 总数 {len(mints)}, "
-            f"缓存命中 {len(result)}, 需查询 {len(uncached_mints)}"
+            "📊 批量查询: 总数 %s, "
+            "缓存命中 %s, 需查询 %s",
+            len(mints), len(result), len(uncached_mints)
         )
         
-        # 2. 查询未缓存的
-        current_time = int(time.time())
-        for mint in uncached_mints:
-            price_info = self.get_price(mint)  # 使用统一接口
-            if price_info:
+        if not uncached_mints:
+            return result
+        
+        # 2. 按策略批量查询未缓存的：每个源一轮请求，查不到的交给下一个源
+        if self.strategy == "single":
+            sources = self.sources[:1]
+        elif self.strategy == "fallback":
+            sources = self.sources
+        else:
+            logger.error("❌ 未知的价格源策略: %s", self.strategy)
+            return result
+        
+        remaining = uncached_mints
+        for source in sources:
+            try:
+                found = self._query_source_batch(source, remaining, now)
+            except Exception as e:
+                logger.error("❌ [%s] 批量查询异常: %s", source.name, e)
+                continue
+            
+            for mint, price_info in found.items():
+                self.cache[mint] = price_info
                 result[mint] = price_info
+            
+            remaining = [mint for mint in remaining if mint not in found]
+            if not remaining:
+                break
+        
+        if remaining:
+            for mint in remaining:
+                self.negative_cache[mint] = True
+            logger.warning("❌ %s 个代币价格查询失败", len(remaining))
         
         return result
     
-    def _is_cached(self, mint: str) -> bool:
+    def get_prices(self, mints: List[str]) -> Dict[str, float]:
         """
-        检查是否有有效缓存
+        批量查询 USD 价格（get_batch_prices 的精简版）
         
         参数:
-            mint: str - 代币地址
+            mints: List[str] - 代币地址列表
         
         返回:
-            bool - 是否有有效缓存
+            dict - {mint: price_usd}，只含查询成功的代币
+        """
+        return {mint: price_info.price_usd for mint, price_info in self.get_batch_prices(mints).items()}
+    
+    def _query_source_batch(self, source, mints: List[str], now: int) -> Dict[str, PriceInfo]:
         """
-        if mint not in self.cache:
-            return False
+        用单个价格源批量查询
         
-        _, cached_time = self.cache[mint]
-        current_time = int(time.time())
+        - 源支持批量请求：一次（分块）往返
+        - 否则：在线程池中并发调用 query
         
-        # 检查是否过期
-        if current_time - cached_time > self.cache_ttl:
-            del self.cache[mint]
-            return False
+        返回:
+            dict - {mint: PriceInfo}
+        """
+        if source.supports_batch:
+            return source.query_batch(mints, now)
         
-        return True
+        price_infos = self._executor.map(partial(source.query, now=now), mints)
+        return {
+            mint: price_info
+            for mint, price_info in zip(mints, price_infos)
+            if price_info
+        }
     
     def clear_cache(self):
-        """清空所有缓存"""
+        """清空所有缓存（含负缓存）"""
         self.cache.clear()
+        self.negative_cache.clear()
         logger.info("🗑️ 价格缓存已清空")
     
+    def clear_negative_cache(self):
+        """清空负缓存（让失败过的代币立即重新查询）"""
+        self.negative_cache.clear()
+        logger.info("🗑️ 价格负缓存已清空")
+    
     def get_cache_stats(self) -> dict:
         """
         获取缓存统计
@@ -206,22 +344,20 @@ class PriceOracle:
         返回:
             dict - 缓存统计信息
         """
-        current_time = int(time.time())
-        valid_count = 0
-        expired_count = 0
-        
-        for mint, (_, cached_time) in self.cache.items():
-            if current_time - cached_time <= self.cache_ttl:
-                valid_count += 1
-            else:
-                expired_count += 1
+        # 先批量清理过期条目（只扫描到第一个未过期条目），剩下的都是有效的
+        expired_count = self.cache.purge()
+        valid_count = len(self.cache)
+        self.negative_cache.purge()
         
         return {
-            'total': len(self.cache),
+            'total': valid_count + expired_count,
             'valid': valid_count,
             'expired': expired_count,
+            'maxsize': self.cache.maxsize,
             'ttl': self.cache_ttl,
-            'sources': [s.get_name() for s in self.sources]
+            'negative': len(self.negative_cache),
+            'negative_ttl': self.negative_cache.ttl,
+            'sources': [s.name for s in self.sources]
         }
     
     def add_source(self, source):
@@ -232,7 +368,7 @@ class PriceOracle:
             source: BasePriceSource - 价格源实例
         """
         self.sources.append(source)
-        logger.info(f"➕ 添加价格源: {source.get_name()}")
+        logger.info("➕ 添加价格源: %s", source.name)
     
     def set_source_priority(self, source_names: List[str]):
         """
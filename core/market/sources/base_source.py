@@ -5,7 +5,7 @@
 """
 
 from abc import ABC, abstractmethod
-from typing import Optional
+from typing import Optional, Dict, List
 from core.data_models import PriceInfo
 
 
@@ -16,19 +16,47 @@ class BasePriceSource(ABC):
     所有价格源必须继承此类并实现query方法
     """
     
+    # 是否原生支持批量查询（一次请求查多个代币）
+    # 为 False 时 PriceOracle 会并发调用 query 代替 query_batch
+    supports_batch = False
+    
+    def __init__(self):
+        """初始化价格源（子类需调用 super().__init__()）"""
+        # 名称是常量，缓存为属性，日志等高频场景直接读 source.name
+        self.name = self.get_name()
+    
     @abstractmethod
-    def query(self, mint: str) -> Optional[PriceInfo]:
+    def query(self, mint: str, now: Optional[int] = None) -> Optional[PriceInfo]:
         """
         查询单个代币价格
         
         参数:
             mint: str - 代币地址
+            now: int - 当前时间戳（可选，批量查询时由调用方统一传入）
         
         返回:
             PriceInfo - 价格信息，失败返回None
         """
         pass
     
+    def query_batch(self, mints: List[str], now: Optional[int] = None) -> Dict[str, PriceInfo]:
+        """
+        批量查询价格（默认逐个调用 query，支持批量的源应覆盖此方法）
+        
+        参数:
+            mints: List[str] - 代币地址列表
+            now: int - 当前时间戳（可选）
+        
+        返回:
+            dict - {mint: PriceInfo}，只包含查询成功的代币
+        """
+        result = {}
+        for mint in mints:
+            price_info = self.query(mint, now)
+            if price_info:
+                result[mint] = price_info
+        return result
+    
     @abstractmethod
     def get_name(self) -> str:
         """
@@ -4,16 +4,24 @@ Helius价格源
 使用Helius DAS API的getAsset方法查询价格
 """
 
+import json
 import time
 import logging
 import requests
-from typing import Optional
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from typing import Optional, Dict, List
 from core.data_models import PriceInfo
-from config import BaseConfig
+from config import BaseConfig, SystemConfig
 from .base_source import BasePriceSource
 
 logger = logging.getLogger(__name__)
 
+# 单次 JSON-RPC 批量请求包含的最大查询数
+_MAX_BATCH_SIZE = 100
+
+_JSON_HEADERS = {"Content-Type": "application/json"}
+
 
 class HeliusSource(BasePriceSource):
     """
@@ -22,26 +30,45 @@ class HeliusSource(BasePriceSource):
     使用Helius DAS API查询代币价格
     """
     
+    supports_batch = True
+    
     def __init__(self):
         """初始化Helius价格源"""
+        super().__init__()
         self.api_key = BaseConfig.HELIUS_API_KEY
         self.rpc_url = f"https://mainnet.helius-rpc.com/?api-key={self.api_key}"
         
         if not self.api_key:
             raise ValueError("❌ HELIUS_API_KEY 未配置")
         
+        # 复用 HTTP 连接（keep-alive），避免每次查询都重新握手 TCP/TLS
+        # 连接池大小与 PriceOracle 的并发数一致；getAsset 是只读调用，POST 可以安全重试
+        self.session = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=10,
+            pool_maxsize=SystemConfig.PRICE_BATCH_CONCURRENCY,
+            max_retries=Retry(
+                total=2,
+                backoff_factor=0.1,
+                status_forcelist=(429, 502, 503, 504),
+                allowed_methods=frozenset({"POST"})
+            )
+        )
+        self.session.mount("https://", adapter)
+        
         logger.debug("✅ Helius价格源初始化完成")
     
     def get_name(self) -> str:
         """获取价格源名称"""
         return "Helius"
     
-    def query(self, mint: str) -> Optional[PriceInfo]:
+    def query(self, mint: str, now: Optional[int] = None) -> Optional[PriceInfo]:
         """
         查询单个代币价格
         
         参数:
             mint: str - 代币地址
+            now: int - 当前时间戳（可选，批量查询时由调用方统一传入）
         
         返回:
             PriceInfo - 价格信息，失败返回None
@@ -56,57 +83,126 @@ class HeliusSource(BasePriceSource):
             }
             
             # 发送请求
-            response = requests.post(self.rpc_url, json=payload, timeout=10)
+            response = self.session.post(self.rpc_url, json=payload, timeout=10)
             response.raise_for_status()
             
-            # 解析响应
-            data = response.json()
+            # 解析响应（直接解析原始字节，省去 response.text 的解码和编码探测）
+            data = json.loads(response.content)
             
             if "result" not in data:
-                logger.warning(f"⚠️ Helius未返回result: {mint[:8]}...")
-                return None
-            
-            result = data["result"]
-            
-            # 提取token_info
-            token_info = result.get("token_info", {})
-            if not token_info:
-                logger.warning(f"⚠️ 无token_info: {mint[:8]}...")
-                return None
-            
-            # 提取价格信息
-            price_info_data = token_info.get("price_info", {})
-            if not price_info_data:
-                logger.warning(f"⚠️ 无price_info: {mint[:8]}...")
-                return None
-            
-            price_usd = price_info_data.get("price_per_token", 0.0)
-            
-            if price_usd <= 0:
-                logger.warning(f"⚠️ 价格无效: {mint[:8]}... = ${price_usd}")
+                logger.warning("⚠️ Helius未返回result: %s...", mint[:8])
                 return None
             
-            # 构造PriceInfo对象
-            price_info = PriceInfo(
-                mint=mint,
-                price_sol=0.0,  # Helius返回USD价格
-                price_usd=price_usd,
-                liquidity=0.0,  # Helius getAsset不返回流动性
-                market_cap=0.0,  # Helius getAsset不返回市值
-                timestamp=int(time.time()),
-                source="Helius"
-            )
-            
-            return price_info
+            timestamp = now if now is not None else int(time.time())
+            return self._parse_result(mint, data["result"], timestamp)
         
         except requests.exceptions.Timeout:
-            logger.error(f"❌ Helius API超时: {mint[:8]}...")
+            logger.error("❌ Helius API超时: %s...", mint[:8])
             return None
         
         except requests.exceptions.RequestException as e:
-            logger.error(f"❌ Helius API请求失败: {e}")
+            logger.error("❌ Helius API请求失败: %s", e)
+            return None
+        
+        except (KeyError, TypeError, ValueError) as e:
+            # 响应格式异常属于可预期的失败，不打印堆栈
+            logger.warning("⚠️ 解析Helius响应失败: %s... (%s)", mint[:8], e)
             return None
         
         except Exception as e:
-            logger.error(f"❌ 解析Helius响应失败: {e}", exc_info=True)
+            logger.error("❌ 解析Helius响应失败: %s", e, exc_info=True)
             return None
+    
+    def query_batch(self, mints: List[str], now: Optional[int] = None) -> Dict[str, PriceInfo]:
+        """
+        批量查询价格（JSON-RPC 批量请求，每 _MAX_BATCH_SIZE 个代币一次往返）
+        
+        参数:
+            mints: List[str] - 代币地址列表
+            now: int - 当前时间戳（可选）
+        
+        返回:
+            dict - {mint: PriceInfo}，只包含查询成功的代币
+        """
+        result = {}
+        timestamp = now if now is not None else int(time.time())
+        
+        for start in range(0, len(mints), _MAX_BATCH_SIZE):
+            chunk = mints[start:start + _MAX_BATCH_SIZE]
+            payload = [
+                {"jsonrpc": "2.0", "id": mint, "method": "getAsset", "params": {"id": mint}}
+                for mint in chunk
+            ]
+            
+            try:
+                # 紧凑序列化：100 个请求的批量 payload 去掉多余空格
+                response = self.session.post(
+                    self.rpc_url,
+                    data=json.dumps(payload, separators=(",", ":")),
+                    headers=_JSON_HEADERS,
+                    timeout=10
+                )
+                response.raise_for_status()
+                data = json.loads(response.content)
+                
+                if not isinstance(data, list):
+                    logger.warning("⚠️ Helius批量响应格式异常: %s", type(data))
+                    continue
+                
+                # 响应顺序不保证与请求一致，按 id 对回 mint
+                for item in data:
+                    mint = item.get("id")
+                    if mint is None or "result" not in item:
+                        continue
+                    price_info = self._parse_result(mint, item["result"], timestamp)
+                    if price_info:
+                        result[mint] = price_info
+            
+            except requests.exceptions.Timeout:
+                logger.error("❌ Helius API批量查询超时 (%s 个代币)", len(chunk))
+            
+            except requests.exceptions.RequestException as e:
+                logger.error("❌ Helius API批量请求失败: %s", e)
+            
+            except (KeyError, TypeError, ValueError) as e:
+                logger.warning("⚠️ 解析Helius批量响应失败 (%s 个代币): %s", len(chunk), e)
+            
+            except Exception as e:
+                logger.error("❌ 解析Helius批量响应失败: %s", e, exc_info=True)
+        
+        return result
+
+    def _parse_result(self, mint: str, result: dict, timestamp: int) -> Optional[PriceInfo]:
+        """
+        从 getAsset 的 result 中提取价格
+        
+        参数:
+            mint: str - 代币地址
+            result: dict - getAsset 返回的 result 字段
+            timestamp: int - 写入 PriceInfo 的时间戳
+        
+        返回:
+            PriceInfo - 价格信息，数据无效返回None
+        """
+        # 一次链式取出价格（result / token_info / price_info 任一缺失都视为无价格）
+        price_usd = (
+            ((result or {}).get("token_info") or {})
+            .get("price_info") or {}
+        ).get("price_per_token") or 0.0
+        
+        if price_usd <= 0:
+            logger.warning("⚠️ 无有效价格: %s... = $%s", mint[:8], price_usd)
+            return None
+        
+        # 构造PriceInfo对象
+        price_info = PriceInfo(
+            mint=mint,
+            price_sol=0.0,  # Helius返回USD价格
+            price_usd=price_usd,
+            liquidity=0.0,  # Helius getAsset不返回流动性
+            market_cap=0.0,  # Helius getAsset不返回市值
+            timestamp=timestamp,
+            source=self.name
+        )
+        
+        return price_info
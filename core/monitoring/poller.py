@@ -9,10 +9,16 @@
 """
 
 import logging
+from collections import deque
 from typing import List, Dict, Tuple, Optional
 
 logger = logging.getLogger(__name__)
 
+# 记住的最近已处理签名数量（用于 O(1) 判断交易是否已见过）
+# 断层时整批都会被当作新交易，窗口需覆盖足够长的历史才能防止重叠轮询重复处理；
+# 10 万个签名约占十几 MB，换来精确去重（Bloom 过滤器的误判会直接漏掉真实交易）
+_RECENT_SIG_LIMIT = 100_000
+
 
 class TransactionPoller:
     """
@@ -31,6 +37,11 @@ class TransactionPoller:
         self.monitor = monitor
         self.last_known_sig = None  # 上一次处理过的最新交易签名（锚点）
         
+        # 最近已处理的签名：deque 维持先后顺序并限长，set 提供 O(1) 查找
+        # 即使 RPC 返回顺序抖动、锚点被重新排到后面，也能识别出已处理过的交易
+        self.recent_sigs = deque()
+        self.recent_set = set()
+        
         logger.info("✅ 交易轮询器初始化完成")
     
     def set_anchor(self, signature: str):
@@ -41,7 +52,24 @@ class TransactionPoller:
             signature: str - 交易签名
         """
         self.last_known_sig = signature
-        logger.info(f"📍 设置锚点: {signature[:8]}...")
+        self._remember([signature])
+        logger.info("📍 设置锚点: %s...", signature[:8])
+    
+    def _remember(self, signatures):
+        """
+        记录已处理的签名（超出上限时淘汰最旧的）
+        
+        参数:
+            signatures: 签名列表（按时间从旧到新）
+        """
+        recent_sigs, recent_set = self.recent_sigs, self.recent_set
+        for sig in signatures:
+            if sig in recent_set:
+                continue
+            recent_sigs.append(sig)
+            recent_set.add(sig)
+            if len(recent_sigs) > _RECENT_SIG_LIMIT:
+                recent_set.discard(recent_sigs.popleft())
     
     def poll(self, limit: int = 20) -> Tuple[List[Dict], bool]:
         """
@@ -52,11 +80,10 @@ class TransactionPoller:
         
         返回:
             tuple: (new_transactions_list, is_gap_detected)
-                - new_transactions_list: 新交易列表 [最新, 次新, ...]
+                - new_transactions_list: 新交易列表 [最旧, ..., 最新]
                 - is_gap_detected: 是否检测到断层
                 
-        注意：返回的列表是 [最新, 次新, ...]
-              Engine处理时通常需要 reversed() 反转
+        注意：返回的列表已按时间从旧到新排列，可直接按顺序处理
         """
         # 1. 从API获取最近的交易
         recent_txs = self.monitor.get_recent_transactions(limit=limit)
@@ -64,7 +91,6 @@ class TransactionPoller:
         if not recent_txs:
             return [], False
         
-        new_txs = []
         gap_detected = False
         
         # 2. 如果没有锚点（第一次运行且无历史记录），只取最新的一笔作为锚点
@@ -72,33 +98,40 @@ class TransactionPoller:
             # 将最新的一笔设为锚点，但不作为"新交易"处理（避免重复处理历史）
             latest_tx = recent_txs[0]
             self.last_known_sig = latest_tx['signature']
-            logger.info(f"🔖 首次运行，建立锚点: {self.last_known_sig[:8]}...")
-            logger.info(f"   不处理历史交易，等待新交易产生")
+            self._remember([self.last_known_sig])
+            logger.info("🔖 首次运行，建立锚点: %s...", self.last_known_sig[:8])
+            logger.info("   不处理历史交易，等待新交易产生")
             # 返回空列表，因为我们只是建立了锚点，还没产生"新"交易
             return [], False
         
-        # 3. 有锚点，开始比对
-        found_anchor = False
-        for tx in recent_txs:
-            if tx['signature'] == self.last_known_sig:
-                found_anchor = True
-                break
-            new_txs.append(tx)
+        # 3. 有锚点，开始比对：定位第一笔已处理过的签名，其之前的都是新交易
+        #    （只做查找，反向切片一次性取出新交易并转为从旧到新，省去逐笔 append 和再反转）
+        recent_set = self.recent_set
+        anchor_idx = next(
+            (i for i, tx in enumerate(recent_txs) if tx['signature'] in recent_set),
+            None
+        )
+        found_anchor = anchor_idx is not None
+        stop = len(recent_txs) if anchor_idx is None else anchor_idx
+        new_txs = recent_txs[stop - 1::-1] if stop else []
         
         # 4. 安全检查：如果抓满了limit数量还没找到锚点，说明中间有断层（漏单风险）
         if not found_anchor and len(new_txs) == limit:
             gap_detected = True
-            logger.warning(f"⚠️ 检测到交易断层！抓取{limit}笔仍未找到锚点")
-            logger.warning(f"   可能有遗漏的交易，建议增大limit或减少扫描间隔")
+            logger.warning("⚠️ 检测到交易断层！抓取%s笔仍未找到锚点", limit)
+            logger.warning("   可能有遗漏的交易，建议增大limit或减少扫描间隔")
             # 在这种情况下，我们只能把这limit笔都当做新交易
             # 并且更新锚点为这批里最新的那个
             if new_txs:
-                self.last_known_sig = new_txs[0]['signature']
-                logger.info(f"   更新锚点: {self.last_known_sig[:8]}...")
+                self.last_known_sig = new_txs[-1]['signature']
+                logger.info("   更新锚点: %s...", self.last_known_sig[:8])
         elif new_txs:
             # 正常找到了锚点，更新锚点为最新的那笔
-            self.last_known_sig = new_txs[0]['signature']
-            logger.debug(f"✅ 发现 {len(new_txs)} 笔新交易，更新锚点")
+            self.last_known_sig = new_txs[-1]['signature']
+            logger.debug("✅ 发现 %s 笔新交易，更新锚点", len(new_txs))
+        
+        if new_txs:
+            self._remember([tx['signature'] for tx in new_txs])
         
         return new_txs, gap_detected
     
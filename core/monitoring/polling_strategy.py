@@ -12,8 +12,8 @@
 - 资产管理
 """
 
+import time
 from enum import Enum
-from datetime import datetime, timedelta
 from config import Config
 import logging
 
@@ -45,7 +45,7 @@ class PollingStrategy:
     def __init__(self):
         """初始化为空闲模式"""
         self.mode = PollingMode.IDLE
-        self.burst_end_time = None
+        self.burst_end_time = 0.0  # 爆发模式结束时刻（time.monotonic 秒）
         logger.debug("轮询策略初始化：空闲模式")
         
     def on_transaction_detected(self):
@@ -59,24 +59,21 @@ class PollingStrategy:
         if self.mode == PollingMode.IDLE:
             # 从空闲切换到爆发
             self.mode = PollingMode.BURST
-            self.burst_end_time = datetime.now() + timedelta(
-                seconds=Config.BURST_DURATION
-            )
+            self.burst_end_time = time.monotonic() + Config.BURST_DURATION
             logger.info(
-                f"⚡ 进入爆发模式（间隔 {Config.BURST_INTERVAL}秒，"
-                f"持续 {Config.BURST_DURATION}秒）"
+                "⚡ 进入爆发模式（间隔 %s秒，"
+                "持续 %s秒）",
+                Config.BURST_INTERVAL, Config.BURST_DURATION
             )
         else:
             # 已在爆发模式，延长时间
             old_end = self.burst_end_time
-            self.burst_end_time = datetime.now() + timedelta(
-                seconds=Config.BURST_DURATION
-            )
+            self.burst_end_time = time.monotonic() + Config.BURST_DURATION
             
             # 只在显著延长时打印日志（避免日志过多）
-            extension = (self.burst_end_time - old_end).seconds
+            extension = int(self.burst_end_time - old_end)
             if extension > 60:
-                logger.info(f"⚡ 延长爆发模式（延长 {extension}秒）")
+                logger.info("⚡ 延长爆发模式（延长 %s秒）", extension)
     
     def get_interval(self) -> int:
         """
@@ -90,7 +87,7 @@ class PollingStrategy:
         """
         if self.mode == PollingMode.BURST:
             # 检查是否应该结束爆发模式
-            if datetime.now() >= self.burst_end_time:
+            if time.monotonic() >= self.burst_end_time:
                 self._switch_to_idle()
                 return Config.IDLE_INTERVAL
             
@@ -108,7 +105,7 @@ class PollingStrategy:
             - 爆发模式：如 "爆发 5s (剩余 295s)"
         """
         if self.mode == PollingMode.BURST:
-            remaining = max(0, (self.burst_end_time - datetime.now()).seconds)
+            remaining = max(0, int(self.burst_end_time - time.monotonic()))
             return f"爆发 {Config.BURST_INTERVAL}s (剩余 {remaining}s)"
         
         return f"空闲 {Config.IDLE_INTERVAL}s"
@@ -116,8 +113,8 @@ class PollingStrategy:
     def _switch_to_idle(self):
         """切换到空闲模式（内部方法）"""
         self.mode = PollingMode.IDLE
-        self.burst_end_time = None
-        logger.info(f"💤 回到空闲模式（间隔 {Config.IDLE_INTERVAL}秒）")
+        self.burst_end_time = 0.0
+        logger.info("💤 回到空闲模式（间隔 %s秒）", Config.IDLE_INTERVAL)
     
     def get_mode(self) -> PollingMode:
         """
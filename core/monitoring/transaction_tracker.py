@@ -13,10 +13,9 @@
 """
 
 import threading
-import time
 import logging
 from datetime import datetime
-from queue import Queue
+from queue import Queue, Full
 
 from config import Config
 from core.monitoring.poller import TransactionPoller
@@ -37,7 +36,7 @@ class TransactionTracker(threading.Thread):
     - 发现交易后通知资产更新线程
     """
         
-    def __init__(self, monitor, processor, presenter, update_queue, asset_updater):
+    def __init__(self, monitor, processor, presenter, update_queue, asset_updater, shutdown=None):
         """
         初始化交易追踪线程
         
@@ -47,6 +46,7 @@ class TransactionTracker(threading.Thread):
             presenter: ConsolePresenter 实例
             update_queue: 通知资产更新的队列
             asset_updater: AssetUpdater 实例
+            shutdown: threading.Event - 全局停止事件（可选，不传则自建）
         """
         super().__init__()
         self.name = "TransactionTracker"
@@ -63,12 +63,17 @@ class TransactionTracker(threading.Thread):
         # 线程间通信
         self.update_queue = update_queue
         
-        # 控制标志
-        self.running = True
+        # 控制标志（停止事件可被多个线程共享，置位后各线程的等待立即返回）
+        self.shutdown = shutdown if shutdown is not None else threading.Event()
         self.initialized = False
         
         logger.info("✅ 交易追踪线程初始化完成")
-        
+    
+    @property
+    def running(self) -> bool:
+        """线程是否仍在运行（停止事件未置位）"""
+        return not self.shutdown.is_set()
+    
     def initialize(self):
         """
         初始化交易锚点
@@ -81,22 +86,21 @@ class TransactionTracker(threading.Thread):
         saved_sig = self.processor.get_last_stored_signature()
         
         if saved_sig:
-            logger.info(f"🔗 恢复交易锚点: {saved_sig[:8]}...")
+            logger.info("🔗 恢复交易锚点: %s...", saved_sig[:8])
             self.poller.set_anchor(saved_sig)
         else:
-            logger.info(f"🆕 无历史数据，开始回溯最近 {Config.INIT_BACKFILL_LIMIT} 笔交易...")
+            logger.info("🆕 无历史数据，开始回溯最近 %s 笔交易...", Config.INIT_BACKFILL_LIMIT)
             recent_txs, _ = self.poller.poll(limit=Config.INIT_BACKFILL_LIMIT)
             
             if recent_txs:
-                logger.info(f"📥 抓取到 {len(recent_txs)} 笔历史交易，正在处理...")
-                ordered_txs = list(reversed(recent_txs))
-                
+                logger.info("📥 抓取到 %s 笔历史交易，正在处理...", len(recent_txs))
+                # poll 返回的交易已按从旧到新排列
                 _, processed_txs = self.processor.process_batch(
-                    ordered_txs, 
+                    recent_txs, 
                     datetime.now().strftime("%H:%M:%S")
                 )
                 
-                last_tx = ordered_txs[-1]
+                last_tx = recent_txs[-1]
                 self.poller.set_anchor(last_tx['signature'])
                 logger.info("✅ 历史交易回溯完成")
             else:
@@ -117,7 +121,7 @@ class TransactionTracker(threading.Thread):
         """
         # 等待初始化
         while not self.initialized and self.running:
-            time.sleep(0.1)
+            self.shutdown.wait(0.1)
         
         if not self.running:
             return
@@ -136,11 +140,11 @@ class TransactionTracker(threading.Thread):
                 
                 # 使用智能轮询策略
                 interval = self.strategy.get_interval()
-                time.sleep(interval)
+                self.shutdown.wait(interval)
                 
             except Exception as e:
-                logger.error(f"💥 交易追踪线程崩溃: {e}", exc_info=True)
-                time.sleep(5)  # 错误后等待5秒再继续
+                logger.error("💥 交易追踪线程崩溃: %s", e, exc_info=True)
+                self.shutdown.wait(5)  # 错误后等待5秒再继续
     
     def _tick(self, check_count):
         """
@@ -163,10 +167,9 @@ class TransactionTracker(threading.Thread):
             # 通知智能轮询器：进入爆发模式
             self.strategy.on_transaction_detected()
             
-            # 处理交易
-            ordered_txs = list(reversed(new_txs))
+            # 处理交易（poll 返回的交易已按从旧到新排列）
             updates_needed, processed_txs = self.processor.process_batch(
-                ordered_txs, 
+                new_txs, 
                 current_time
             )
             
@@ -180,12 +183,16 @@ class TransactionTracker(threading.Thread):
             
             # 通知资产更新线程
             if updates_needed:
-                self.update_queue.put({
-                    'type': 'transaction_update',
-                    'time': current_time,
-                    'count': len(new_txs)
-                })
-                logger.debug(f"📬 通知资产更新线程（{len(new_txs)} 笔交易）")
+                # 已有未处理的通知时直接丢弃，资产更新线程只关心"有变化"
+                try:
+                    self.update_queue.put_nowait({
+                        'type': 'transaction_update',
+                        'time': current_time,
+                        'count': len(new_txs)
+                    })
+                    logger.debug("📬 通知资产更新线程（%s 笔交易）", len(new_txs))
+                except Full:
+                    logger.debug("📭 已有待处理的更新通知，本次合并")
         
         else:
             # 无新交易，显示空闲状态
@@ -201,7 +208,7 @@ class TransactionTracker(threading.Thread):
     def stop(self):
         """优雅停止线程"""
         logger.info("🛑 正在停止交易追踪线程...")
-        self.running = False
+        self.shutdown.set()
     
     def get_strategy(self):
         """获取轮询策略（供外部查询）"""
@@ -13,16 +13,17 @@
 - 不直接处理数据
 """
 
+import gc
 import signal
-import sys
 import logging
-from queue import Queue
+import threading
 
 from config import Config
 from monitors.helius_monitor import HeliusMonitor
 
 from core.assets.asset_manager import AssetManager
 from core.orchestration.processor import TransactionProcessor
+from core.orchestration.spsc_ring import SPSCQueue
 # from core.trading.deprecated.virtual_trader_deprecated import VirtualTrader  # ← 已废弃
 from core.assets.asset_updater import AssetUpdater
 from core.assets.price_updater import PriceUpdater
@@ -53,14 +54,19 @@ class Orchestrator:
         self.processor = TransactionProcessor(Config.TARGET_WALLET)
         self.presenter = ConsolePresenter()
         
-        # 2. 线程间通信队列
-        self.update_queue = Queue()  # 交易追踪 → 资产更新
+        # 2. 全局停止事件（所有线程共享，置位后各线程的等待立即返回）
+        self.shutdown = threading.Event()
+        
+        # 线程间通信队列
+        # 交易追踪 → 资产更新（容量为 1：已有待处理通知时丢弃新通知，由消费者合并处理）
+        self.update_queue = SPSCQueue(maxsize=1)
         
         # 3. 初始化线程（✅ 修复：先创建 asset_updater，再创建 tracker）
         self.asset_updater = AssetUpdater(
             asset_manager=self.assets,
             presenter=self.presenter,
-            update_queue=self.update_queue
+            update_queue=self.update_queue,
+            shutdown=self.shutdown
         )
         
         self.tracker = TransactionTracker(
@@ -68,13 +74,19 @@ class Orchestrator:
             processor=self.processor,
             presenter=self.presenter,
             update_queue=self.update_queue,
-            asset_updater=self.asset_updater  # ✅ 现在 asset_updater 已经存在了
+            asset_updater=self.asset_updater,  # ✅ 现在 asset_updater 已经存在了
+            shutdown=self.shutdown
         )
         
-        self.price_updater = PriceUpdater(
-            asset_manager=self.assets,
-            presenter=self.presenter
-        )
+        # 价格更新线程（配置关闭时不创建，避免空转占用线程）
+        self.price_updater = None
+        if Config.ENABLE_PRICE_UPDATER:
+            self.price_updater = PriceUpdater(
+                asset_manager=self.assets,
+                presenter=self.presenter,
+                asset_updater=self.asset_updater,
+                shutdown=self.shutdown
+            )
         
         # 4. 信号处理
         signal.signal(signal.SIGINT, self._signal_handler)
@@ -90,9 +102,10 @@ class Orchestrator:
             sig: 信号类型
             frame: 栈帧
         """
+        # 只置位停止事件：信号处理函数可能打断持锁中的代码，
+        # 真正的停止和 join 交给主线程在 wait() 中完成
         logger.info("\n🛑 收到停止信号，正在优雅停止...")
-        self.stop()
-        sys.exit(0)
+        self.shutdown.set()
     
     def initialize(self):
         """
@@ -116,6 +129,11 @@ class Orchestrator:
         logger.info("🔗 初始化交易锚点...")
         self.tracker.initialize()
         
+        # 初始化阶段创建的对象（模块、配置、组件、历史数据）会常驻内存，
+        # 移入永久代后循环 GC 不再反复扫描它们，只需处理运行期的短命对象
+        gc.collect()
+        gc.freeze()
+        
         logger.info("✅ 系统初始化完成")
     
     def start(self):
@@ -124,7 +142,7 @@ class Orchestrator:
         
         顺序：
         1. 资产更新线程（后台）
-        2. 价格更新线程（后台，暂时禁用）
+        2. 价格更新线程（后台，需 Config.ENABLE_PRICE_UPDATER 开启）
         3. 交易追踪线程（主要任务）
         """
         logger.info("🚀 启动所有线程...")
@@ -133,9 +151,10 @@ class Orchestrator:
         self.asset_updater.start()
         logger.info("✅ 资产更新线程已启动")
         
-        # 2. 启动价格更新线程（暂时禁用，避免与资产更新冲突）
-        # self.price_updater.start()
-        # logger.info("✅ 价格更新线程已启动")
+        # 2. 启动价格更新线程（由 Config.ENABLE_PRICE_UPDATER 控制）
+        if self.price_updater is not None:
+            self.price_updater.start()
+            logger.info("✅ 价格更新线程已启动")
         
         # 3. 启动交易追踪线程
         self.tracker.start()
@@ -147,21 +166,21 @@ class Orchestrator:
         """
         等待所有线程结束
         
-        主线程阻塞在这里，直到所有工作线程结束
+        主线程阻塞在这里，直到收到停止信号或所有工作线程结束，然后统一停止
         """
+        threads = [self.tracker, self.asset_updater]
+        if self.price_updater is not None:
+            threads.append(self.price_updater)
+        
         try:
-            # 等待交易追踪线程
-            self.tracker.join()
-            
-            # 等待资产更新线程
-            self.asset_updater.join()
-            
-            # 等待价格更新线程（如果启动了）
-            # self.price_updater.join()
-            
+            # 定期醒来检查线程存活（工作线程全部退出时也结束等待）
+            while not self.shutdown.wait(1.0):
+                if not any(t.is_alive() for t in threads):
+                    break
         except KeyboardInterrupt:
             logger.info("\n🛑 收到中断信号...")
-            self.stop()
+        
+        self.stop()
     
     def stop(self):
         """
@@ -182,12 +201,14 @@ class Orchestrator:
         self.asset_updater.stop()
         
         # 3. 停止价格更新线程（如果启动了）
-        # self.price_updater.stop()
+        if self.price_updater is not None:
+            self.price_updater.stop()
         
         # 4. 等待线程结束（最多等待5秒）
         self.tracker.join(timeout=5)
         self.asset_updater.join(timeout=5)
-        # self.price_updater.join(timeout=5)
+        if self.price_updater is not None:
+            self.price_updater.join(timeout=5)
         
         logger.info("✅ 所有线程已停止")
     
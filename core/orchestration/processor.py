@@ -40,36 +40,31 @@ class TransactionProcessor:
         if not transactions:
             return False, []
 
-        updates_needed = False
-        processed_txs = []
-        
         # 记录捕获时间（批次统一时间）
         captured_at = time.time()
         
-        # 遍历每一笔交易
-        for tx in transactions:
-            try:
-                # 1. 分析交易
-                analyzed_tx = TransactionAnalyzer.analyze(tx, captured_at)
-                
-                # 2. 保存到JSON
-                success = self.transaction_logger.save_transaction(analyzed_tx)
-                
-                if success:
-                    # 3. 收集交易信息（用于返回）
-                    processed_txs.append({
-                        'time_str': time_str,
-                        'description': analyzed_tx['description'],
-                        'signature': analyzed_tx['signature'],
-                        'analyzed_type': analyzed_tx['analyzed_type'],
-                        'delay': analyzed_tx['delay']
-                    })
-                    
-                    # 4. 标记需要更新资产
-                    updates_needed = True
-
-            except Exception as e:
-                logger.error(f"处理交易出错: {e} | Sig: {tx.get('signature')}")
-                continue
-
-        return updates_needed, processed_txs
+        try:
+            # 1. 批量分析交易
+            analyzed_txs = TransactionAnalyzer.analyze_batch(transactions, captured_at)
+            
+            # 2. 批量保存到JSON（整批只读写一次文件）
+            saved_txs = self.transaction_logger.save_transactions(analyzed_txs)
+        
+        except Exception as e:
+            logger.error(f"处理交易出错: {e} | 批次 {len(transactions)} 笔")
+            return False, []
+        
+        # 3. 收集交易信息（用于返回）
+        processed_txs = [
+            {
+                'time_str': time_str,
+                'description': analyzed_tx['description'],
+                'signature': analyzed_tx['signature'],
+                'analyzed_type': analyzed_tx['analyzed_type'],
+                'delay': analyzed_tx['delay']
+            }
+            for analyzed_tx in saved_txs
+        ]
+        
+        # 4. 有交易保存成功即需要更新资产
+        return bool(processed_txs), processed_txs
@@ -0,0 +1,164 @@
+"""
+单生产者/单消费者队列
+
+职责：
+- 替代 queue.Queue 作为线程间通知通道（TransactionTracker → AssetUpdater）
+- 接口与 queue.Queue 保持一致（put / put_nowait / get / get_nowait），调用方无需改动
+
+实现：
+- collections.deque 的 append / popleft 在 GIL 下是原子的，收发本身不需要加锁
+- 只有消费者在队列为空、需要阻塞等待时才用到 threading.Event
+- 生产者仅在事件未置位时才 set()，突发写入时不会每条消息都触发 Condition 通知
+
+注意：
+- 仅保证一个生产者线程 + 一个消费者线程的正确性
+- 停止消费者用 close()，不要再从其他线程 put 哨兵消息（那样就变成了多生产者）
+"""
+
+import time
+import threading
+from collections import deque
+from queue import Empty, Full
+
+
+class SPSCQueue:
+    """
+    单生产者/单消费者队列
+    
+    maxsize <= 0 表示不限容量；有容量上限时 put_nowait 满了抛出 queue.Full
+    """
+    __slots__ = ('maxsize', '_items', '_ready', '_closed')
+    
+    def __init__(self, maxsize: int = 0):
+        """
+        初始化队列
+        
+        参数:
+            maxsize: int - 容量上限（<= 0 表示不限）
+        """
+        self.maxsize = maxsize
+        self._items = deque()
+        self._ready = threading.Event()  # 有数据时置位，唤醒阻塞的消费者
+        self._closed = False
+    
+    def put_nowait(self, item):
+        """
+        非阻塞写入
+        
+        参数:
+            item: 消息
+        
+        异常:
+            queue.Full - 队列已满
+        """
+        if 0 < self.maxsize <= len(self._items):
+            raise Full
+        self._items.append(item)
+        # 消费者在 clear() 之后会再检查一次队列，所以已置位时可以跳过 set()
+        if not self._ready.is_set():
+            self._ready.set()
+    
+    def put(self, item, block: bool = True, timeout: float = None):
+        """
+        写入消息（队列满时按 block/timeout 等待空位）
+        
+        参数:
+            item: 消息
+            block: bool - 队列满时是否等待
+            timeout: float - 最长等待秒数（None 表示一直等）
+        
+        异常:
+            queue.Full - 非阻塞或等待超时后队列仍满
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            try:
+                return self.put_nowait(item)
+            except Full:
+                if not block or (deadline is not None and time.monotonic() >= deadline):
+                    raise
+            # 只有一个消费者在取，短暂让出 CPU 等它腾出空位
+            time.sleep(0.001)
+    
+    def get(self, block: bool = True, timeout: float = None):
+        """
+        读取消息（队列空时按 block/timeout 等待）
+        
+        参数:
+            block: bool - 队列空时是否等待
+            timeout: float - 最长等待秒数（None 表示一直等）
+        
+        返回:
+            最早写入的消息
+        
+        异常:
+            queue.Empty - 非阻塞或等待超时后队列仍为空
+        """
+        items, ready = self._items, self._ready
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            try:
+                return items.popleft()
+            except IndexError:
+                pass
+            if not block or self._closed:
+                raise Empty
+            
+            # 先清除事件再复查队列：生产者若在两者之间写入，复查即可取到；
+            # 若在复查之后写入，set() 会让下面的 wait 立即返回，不会丢失唤醒
+            ready.clear()
+            if items:
+                continue
+            
+            if deadline is None:
+                ready.wait()
+            else:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0 or not ready.wait(remaining):
+                    if not items:
+                        raise Empty
+    
+    def close(self):
+        """
+        关闭队列：唤醒阻塞的消费者，之后队列取空时 get 立即抛出 queue.Empty
+        
+        可从任意线程调用，不占用生产者通道
+        """
+        self._closed = True
+        self._ready.set()
+    
+    def get_nowait(self):
+        """非阻塞读取，队列空时抛出 queue.Empty"""
+        return self.get(block=False)
+    
+    def drain_nowait(self, max_items: int = 256) -> list:
+        """
+        一次性取出当前所有消息（非阻塞）
+        
+        参数:
+            max_items: int - 单次最多取出的条数
+        
+        返回:
+            list - 按写入顺序排列的消息，队列为空时返回空列表
+        """
+        items = self._items
+        drained = []
+        append = drained.append
+        while len(drained) < max_items:
+            try:
+                append(items.popleft())
+            except IndexError:
+                break
+        return drained
+    
+    def qsize(self) -> int:
+        """当前消息数"""
+        return len(self._items)
+    
+    def empty(self) -> bool:
+        """队列是否为空"""
+        return not self._items
+
+
+# 便捷导出
+__all__ = ['SPSCQueue']
@@ -9,9 +9,10 @@
 """
 
 import logging
+import threading
 import time
-from typing import Optional
-from core.data_models import TradeSignal, TradingDecision, ExecutionResult, RiskAction, TradeAction
+from typing import List, Optional
+from core.data_models import TradeSignal, TradingDecision, ExecutionResult, RiskAction, TradeAction, SignalResult
 from core.trading.strategy import TradingStrategy
 from core.trading.risk_controller import RiskController
 from core.trading.executor import VirtualExecutor
@@ -21,6 +22,12 @@ from storage.json_storage import JsonStorage
 
 logger = logging.getLogger(__name__)
 
+# 日志分隔线
+SEP = "=" * 60
+
+# 协调器统计项
+_STAT_KEYS = ('total_signals', 'executed_trades', 'skipped_trades', 'failed_trades')
+
 
 class TradingCoordinator:
     """
@@ -65,15 +72,13 @@ class TradingCoordinator:
         self.risk_controller = RiskController(self.position_manager, storage)
         logger.info("✅ 风险控制器已加载")
         
-        # 统计数据
-        self.total_signals = 0
-        self.executed_trades = 0
-        self.skipped_trades = 0
-        self.failed_trades = 0
+        # 统计数据（process_signal 可能被多个线程并发调用，计数统一在锁内增减）
+        self._stats_lock = threading.Lock()
+        self._stats = dict.fromkeys(_STAT_KEYS, 0)
         
         logger.info("🎉 交易协调器初始化完成")
     
-    def process_signal(self, signal: TradeSignal) -> dict:
+    def process_signal(self, signal: TradeSignal) -> SignalResult:
         """
         处理交易信号（主流程）
         
@@ -81,23 +86,23 @@ class TradingCoordinator:
             signal: TradeSignal - 交易信号
         
         返回:
-            dict - 处理结果
+            SignalResult - 处理结果
         """
-        self.total_signals += 1
+        signal_no = self._bump('total_signals')
         
-        logger.info("=" * 60)
-        logger.info(f"📨 收到交易信号 #{self.total_signals}")
-        logger.info(f"   动作: {signal.action}")
-        logger.info(f"   代币: {signal.token_symbol}")
-        logger.info(f"   数量: {signal.amount:.4f}")
-        logger.info("=" * 60)
+        logger.info(SEP)
+        logger.info("📨 收到交易信号 #%s", signal_no)
+        logger.info("   动作: %s", signal.action)
+        logger.info("   代币: %s", signal.token_symbol)
+        logger.info("   数量: %.4f", signal.amount)
+        logger.info(SEP)
         
         try:
             # 步骤1：检查风控状态
             allowed, reason = self.risk_controller.check_trading_allowed()
             if not allowed:
-                logger.warning(f"🚫 风控禁止交易: {reason}")
-                self.skipped_trades += 1
+                logger.warning("🚫 风控禁止交易: %s", reason)
+                self._bump('skipped_trades')
                 return self._create_result(
                     success=False,
                     stage="风控检查",
@@ -109,11 +114,11 @@ class TradingCoordinator:
             current_balance = self.executor.get_balance()
             decision = self.strategy.decide(signal, current_balance)
             
-            logger.info(f"🎯 策略决策: {'执行' if decision.should_trade else '跳过'}")
-            logger.info(f"   理由: {decision.reason}")
+            logger.info("🎯 策略决策: %s", '执行' if decision.should_trade else '跳过')
+            logger.info("   理由: %s", decision.reason)
             
             if not decision.should_trade:
-                self.skipped_trades += 1
+                self._bump('skipped_trades')
                 return self._create_result(
                     success=False,
                     stage="策略决策",
@@ -130,8 +135,8 @@ class TradingCoordinator:
             # 步骤4：执行交易
             price_info = self.price_oracle.get_price(signal.token_mint)
             if not price_info:
-                logger.error(f"❌ 无法获取价格信息: {signal.token_symbol}")
-                self.failed_trades += 1
+                logger.error("❌ 无法获取价格信息: %s", signal.token_symbol)
+                self._bump('failed_trades')
                 return self._create_result(
                     success=False,
                     stage="价格查询",
@@ -149,18 +154,18 @@ class TradingCoordinator:
                     is_profit = execution_result.realized_pnl > 0
                     self.risk_controller.record_trade_result(is_profit)
                 
-                self.executed_trades += 1
+                self._bump('executed_trades')
                 
-                logger.info("=" * 60)
-                logger.info(f"✅ 交易执行成功")
-                logger.info(f"   代币: {execution_result.token_symbol}")
-                logger.info(f"   动作: {execution_result.action.value}")
-                logger.info(f"   价格: ${execution_result.executed_price:.6f}")
-                logger.info(f"   数量: {execution_result.executed_amount:.4f}")
-                logger.info(f"   余额: ${execution_result.balance_after:.2f}")
+                logger.info(SEP)
+                logger.info("✅ 交易执行成功")
+                logger.info("   代币: %s", execution_result.token_symbol)
+                logger.info("   动作: %s", execution_result.action.value)
+                logger.info("   价格: $%.6f", execution_result.executed_price)
+                logger.info("   数量: %.4f", execution_result.executed_amount)
+                logger.info("   余额: $%.2f", execution_result.balance_after)
                 if execution_result.realized_pnl is not None:
-                    logger.info(f"   盈亏: ${execution_result.realized_pnl:+.2f}")
-                logger.info("=" * 60)
+                    logger.info("   盈亏: $%+.2f", execution_result.realized_pnl)
+                logger.info(SEP)
                 
                 return self._create_result(
                     success=True,
@@ -171,8 +176,8 @@ class TradingCoordinator:
                     execution=execution_result
                 )
             else:
-                self.failed_trades += 1
-                logger.error(f"❌ 交易执行失败: {execution_result.error_message}")
+                self._bump('failed_trades')
+                logger.error("❌ 交易执行失败: %s", execution_result.error_message)
                 
                 return self._create_result(
                     success=False,
@@ -184,8 +189,8 @@ class TradingCoordinator:
                 )
         
         except Exception as e:
-            self.failed_trades += 1
-            logger.error(f"💥 处理信号时出错: {e}", exc_info=True)
+            self._bump('failed_trades')
+            logger.error("💥 处理信号时出错: %s", e, exc_info=True)
             
             return self._create_result(
                 success=False,
@@ -194,6 +199,40 @@ class TradingCoordinator:
                 signal=signal
             )
     
+    def process_signals(self, signals: List[TradeSignal]) -> List[SignalResult]:
+        """
+        批量处理交易信号
+        
+        参数:
+            signals: List[TradeSignal] - 按时间顺序排列的交易信号
+        
+        返回:
+            List[SignalResult] - 与 signals 一一对应的处理结果
+        
+        说明：
+        - 价格查询是整条流程里最慢的一步（网络往返），先对整批代币并发预取价格写入缓存
+        - 之后按原顺序逐个 process_signal，策略和执行阶段直接命中缓存，
+          K 个信号只需约 1 次往返的等待，而不是 K 次
+        - 交易本身仍串行执行，余额与持仓的变化顺序与信号顺序一致
+        """
+        if not signals:
+            return []
+        
+        # 去重后多于一个代币才值得预取（单个代币由 process_signal 自己查）
+        mints = list(dict.fromkeys(signal.token_mint for signal in signals))
+        if len(mints) > 1:
+            allowed, _ = self.risk_controller.check_trading_allowed()
+            if allowed:
+                try:
+                    self.price_oracle.get_batch_prices(mints)
+                except Exception as e:
+                    # 预取失败不影响后续流程，process_signal 会再单独查询
+                    logger.warning("⚠️ 批量预取价格失败: %s", e)
+        
+        # 整批交易的余额/交易记录/统计写入合并，每个文件只写一次
+        with self.storage.batch():
+            return [self.process_signal(signal) for signal in signals]
+    
     def check_risk_actions(self) -> list:
         """
         检查是否有风控动作需要执行
@@ -209,69 +248,76 @@ class TradingCoordinator:
         
         results = []
         
-        for action in risk_actions:
-            logger.warning("=" * 60)
-            logger.warning(f"⚠️ 风控动作触发")
-            logger.warning(f"   类型: {action.action_type.value}")
-            logger.warning(f"   代币: {action.symbol}")
-            logger.warning(f"   原因: {action.reason}")
-            logger.warning("=" * 60)
-            
-            try:
-                # 创建卖出决策
-                decision = TradingDecision(
-                    should_trade=True,
-                    action=TradeAction.SELL,
-                    token_mint=action.mint,
-                    token_symbol=action.symbol,
-                    amount=action.suggested_amount,
-                    estimated_cost=0.0,
-                    reason=f"风控触发: {action.reason}",
-                    current_balance=self.executor.get_balance(),
-                    position_amount=action.suggested_amount
-                )
-                
-                # 获取价格
-                price_info = self.price_oracle.get_price(action.mint)
-                if not price_info:
-                    logger.error(f"❌ 无法获取价格: {action.symbol}")
-                    results.append({
-                        'success': False,
-                        'action': action,
-                        'reason': '无法获取价格'
-                    })
-                    continue
-                
-                # 执行卖出
-                execution_result = self.executor.execute_sell(decision, price_info)
+        # 一次批量查询所有触发风控的代币价格（多个止损同时触发时只需一次往返）
+        price_map = self.price_oracle.get_batch_prices(
+            list({action.mint for action in risk_actions})
+        )
+        
+        # 多个风控卖出的存储写入合并，每个文件只写一次
+        with self.storage.batch():
+            for action in risk_actions:
+                logger.warning(SEP)
+                logger.warning("⚠️ 风控动作触发")
+                logger.warning("   类型: %s", action.action_type.value)
+                logger.warning("   代币: %s", action.symbol)
+                logger.warning("   原因: %s", action.reason)
+                logger.warning(SEP)
                 
-                if execution_result.success:
-                    # 记录交易结果
-                    if execution_result.realized_pnl is not None:
-                        is_profit = execution_result.realized_pnl > 0
-                        self.risk_controller.record_trade_result(is_profit)
+                try:
+                    # 创建卖出决策
+                    decision = TradingDecision(
+                        should_trade=True,
+                        action=TradeAction.SELL,
+                        token_mint=action.mint,
+                        token_symbol=action.symbol,
+                        amount=action.suggested_amount,
+                        estimated_cost=0.0,
+                        reason=f"风控触发: {action.reason}",
+                        current_balance=self.executor.get_balance(),
+                        position_amount=action.suggested_amount
+                    )
                     
-                    logger.info(f"✅ 风控卖出成功: {action.symbol}")
-                    results.append({
-                        'success': True,
-                        'action': action,
-                        'execution': execution_result
-                    })
-                else:
-                    logger.error(f"❌ 风控卖出失败: {execution_result.error_message}")
+                    # 获取价格
+                    price_info = price_map.get(action.mint)
+                    if not price_info:
+                        logger.error("❌ 无法获取价格: %s", action.symbol)
+                        results.append({
+                            'success': False,
+                            'action': action,
+                            'reason': '无法获取价格'
+                        })
+                        continue
+                    
+                    # 执行卖出
+                    execution_result = self.executor.execute_sell(decision, price_info)
+                    
+                    if execution_result.success:
+                        # 记录交易结果
+                        if execution_result.realized_pnl is not None:
+                            is_profit = execution_result.realized_pnl > 0
+                            self.risk_controller.record_trade_result(is_profit)
+                        
+                        logger.info("✅ 风控卖出成功: %s", action.symbol)
+                        results.append({
+                            'success': True,
+                            'action': action,
+                            'execution': execution_result
+                        })
+                    else:
+                        logger.error("❌ 风控卖出失败: %s", execution_result.error_message)
+                        results.append({
+                            'success': False,
+                            'action': action,
+                            'reason': execution_result.error_message
+                        })
+                
+                except Exception as e:
+                    logger.error("💥 执行风控动作时出错: %s", e, exc_info=True)
                     results.append({
                         'success': False,
                         'action': action,
-                        'reason': execution_result.error_message
+                        'reason': f"系统错误: {str(e)}"
                     })
-            
-            except Exception as e:
-                logger.error(f"💥 执行风控动作时出错: {e}", exc_info=True)
-                results.append({
-                    'success': False,
-                    'action': action,
-                    'reason': f"系统错误: {str(e)}"
-                })
         
         return results
     
@@ -282,22 +328,32 @@ class TradingCoordinator:
             if not positions:
                 return
             
-            # 批量查询价格
+            # 批量查询价格（每个价格源一轮批量请求，只含查询成功的代币）
             mints = [pos.mint for pos in positions]
-            prices = self.price_oracle.get_prices_batch(mints)
+            price_map = self.price_oracle.get_prices(mints)
             
-            # 更新价格
-            price_map = {}
-            for mint, price_info in zip(mints, prices):
-                if price_info:
-                    price_map[mint] = price_info.price_usd
+            # 更新价格（价格未变的持仓由 update_prices 自行跳过）
+            updated = self.position_manager.update_prices(price_map)
             
-            if price_map:
-                self.position_manager.update_prices(price_map)
-                logger.debug(f"📊 更新了 {len(price_map)} 个持仓的价格")
+            if updated:
+                logger.debug("📊 更新了 %s 个持仓的价格", updated)
         
         except Exception as e:
-            logger.error(f"❌ 更新持仓价格失败: {e}")
+            logger.error("❌ 更新持仓价格失败: %s", e)
+    
+    def flush(self, min_interval: float = 1.0):
+        """
+        持久化待保存的持仓（合并同一时间段内的多次修改）
+        
+        参数:
+            min_interval: float - 两次写盘的最小间隔（秒），传 0 强制立即写盘
+        """
+        self.position_manager.flush(min_interval)
+    
+    def close(self):
+        """停止时调用：持仓、交易记录全部落盘并等待后台写盘完成"""
+        self.position_manager.close()
+        self.executor.close()
     
     def get_statistics(self) -> dict:
         """
@@ -306,20 +362,36 @@ class TradingCoordinator:
         返回:
             dict - 统计信息
         """
+        with self._stats_lock:
+            stats = dict(self._stats)  # 一致的快照
+        
+        total_signals = stats['total_signals']
         return {
-            "total_signals": self.total_signals,
-            "executed_trades": self.executed_trades,
-            "skipped_trades": self.skipped_trades,
-            "failed_trades": self.failed_trades,
-            "execution_rate": self.executed_trades / self.total_signals if self.total_signals > 0 else 0,
+            **stats,
+            "execution_rate": stats['executed_trades'] / total_signals if total_signals > 0 else 0,
             "current_balance": self.executor.get_balance(),
             "total_value": self.executor.get_total_value(),
             "position_count": self.position_manager.get_position_count(),
             "risk_status": self.risk_controller.get_risk_summary()
         }
     
+    def _bump(self, key: str) -> int:
+        """
+        统计计数 +1（线程安全）
+        
+        参数:
+            key: str - 统计项名称
+        
+        返回:
+            int - 递增后的值
+        """
+        with self._stats_lock:
+            value = self._stats[key] + 1
+            self._stats[key] = value
+        return value
+    
     def _create_result(self, success: bool, stage: str, reason: str, 
-                      signal: TradeSignal, decision=None, execution=None) -> dict:
+                      signal: TradeSignal, decision=None, execution=None) -> SignalResult:
         """
         创建统一的处理结果
         
@@ -332,41 +404,17 @@ class TradingCoordinator:
             execution: ExecutionResult - 执行结果（可选）
         
         返回:
-            dict - 处理结果
+            SignalResult - 处理结果（需要字典时调用 to_dict()）
         """
-        result = {
-            "success": success,
-            "stage": stage,
-            "reason": reason,
-            "signal": {
-                "action": signal.action,
-                "token_mint": signal.token_mint,
-                "token_symbol": signal.token_symbol,
-                "amount": signal.amount,
-                "timestamp": signal.timestamp
-            },
-            "timestamp": int(time.time())
-        }
-        
-        if decision:
-            result["decision"] = {
-                "should_trade": decision.should_trade,
-                "action": decision.action.value if hasattr(decision.action, 'value') else str(decision.action),
-                "amount": decision.amount,
-                "reason": decision.reason
-            }
-        
-        if execution:
-            result["execution"] = {
-                "success": execution.success,
-                "executed_price": execution.executed_price,
-                "executed_amount": execution.executed_amount,
-                "cost": execution.cost,
-                "balance_after": execution.balance_after,
-                "realized_pnl": execution.realized_pnl
-            }
-        
-        return result
+        return SignalResult(
+            success=success,
+            stage=stage,
+            reason=reason,
+            signal=signal,
+            timestamp=int(time.time()),
+            decision=decision,
+            execution=execution
+        )
     
     def resume_trading(self, note: str = "手动恢复"):
         """
@@ -384,14 +432,12 @@ class TradingCoordinator:
         参数:
             reason: str - 重置原因
         """
-        logger.info(f"🔄 重置会话: {reason}")
+        logger.info("🔄 重置会话: %s", reason)
         self.executor.reset_session(reason)
         
         # 重新初始化统计
-        self.total_signals = 0
-        self.executed_trades = 0
-        self.skipped_trades = 0
-        self.failed_trades = 0
+        with self._stats_lock:
+            self._stats = dict.fromkeys(_STAT_KEYS, 0)
         
         logger.info("✅ 会话重置完成")
 
@@ -11,11 +11,18 @@
 
 import logging
 import time
-from typing import List, Optional
+from typing import Any, Dict, Final, List, Optional, Sequence, Tuple
 from core.data_models import TradeSignal
 
 logger = logging.getLogger(__name__)
 
+# WSOL（包装SOL）的 mint 地址
+WSOL_MINT: Final = "So11111111111111111111111111111111111111112"
+
+# 交易类型 → 是否为 SWAP 的记忆表
+# Helius 的交易类型是有限的枚举值，每种类型只做一次子串判断，之后都是一次 dict 查找
+_SWAP_TYPE_MEMO: Dict[str, bool] = {'SWAP': True, 'UNKNOWN': False}
+
 
 class SignalParser:
     """
@@ -32,12 +39,12 @@ class SignalParser:
         参数:
             target_wallet: str - 目标钱包地址
         """
-        self.target_wallet = target_wallet
-        self.wsol_mint = "So11111111111111111111111111111111111111112"
+        self.target_wallet: str = target_wallet
+        self.wsol_mint: str = WSOL_MINT
         
         logger.debug(f"✅ 信号解析器初始化完成，目标钱包: {target_wallet[:8]}...")
     
-    def parse(self, tx_data: dict) -> List[TradeSignal]:
+    def parse(self, tx_data: Dict[str, Any]) -> List[TradeSignal]:
         """
         解析交易数据，返回 TradeSignal 列表
         
@@ -52,13 +59,19 @@ class SignalParser:
             if not self._is_swap_transaction(tx_data):
                 return []
             
-            # 2. 提取交易数据
-            sol_change = self._calculate_sol_change(tx_data.get('nativeTransfers', []))
-            token_change, token_mint, token_symbol = self._calculate_token_change(
-                tx_data.get('tokenTransfers', [])
+            # 2. 无任何转账（失败交易、聚合器内层交易等）直接跳过
+            native_transfers = tx_data.get('nativeTransfers')
+            token_transfers = tx_data.get('tokenTransfers')
+            if not native_transfers and not token_transfers:
+                return []
+            
+            # 3. 提取交易数据（SOL 和 Token 变动一次算出）
+            sol_change, token_change, token_mint, token_symbol = self._calculate_changes(
+                native_transfers or (),
+                token_transfers or ()
             )
             
-            # 3. 判定交易方向并生成信号
+            # 4. 判定交易方向并生成信号
             signal = self._create_signal(
                 sol_change, 
                 token_change, 
@@ -68,7 +81,7 @@ class SignalParser:
                 tx_data.get('timestamp', int(time.time()))
             )
             
-            # 4. 返回列表格式
+            # 5. 返回列表格式
             if signal:
                 return [signal]
             else:
@@ -78,7 +91,7 @@ class SignalParser:
             logger.error(f"⚠️ 解析信号出错: {e}")
             return []
     
-    def _is_swap_transaction(self, tx_data: dict) -> bool:
+    def _is_swap_transaction(self, tx_data: Dict[str, Any]) -> bool:
         """
         判断是否为 SWAP 交易
         
@@ -89,64 +102,68 @@ class SignalParser:
             bool - 是否为SWAP
         """
         tx_type = tx_data.get('type') or 'UNKNOWN'
-        return isinstance(tx_type, str) and "SWAP" in tx_type
+        if not isinstance(tx_type, str):
+            return False
+        
+        is_swap = _SWAP_TYPE_MEMO.get(tx_type)
+        if is_swap is None:
+            # 兼容包含 SWAP 的组合类型
+            is_swap = _SWAP_TYPE_MEMO[tx_type] = "SWAP" in tx_type
+        return is_swap
     
-    def _calculate_sol_change(self, native_transfers: list) -> float:
+    def _calculate_changes(
+        self,
+        native_transfers: Sequence[Dict[str, Any]],
+        token_transfers: Sequence[Dict[str, Any]]
+    ) -> Tuple[float, float, Optional[str], str]:
         """
-        计算 SOL 余额变动
+        单次遍历计算 SOL 和 Token 余额变动
         
         参数:
             native_transfers: list - 原生代币转账列表
+            token_transfers: list - 代币转账列表
         
         返回:
-            float - SOL变动量（正数=收入，负数=支出）
+            tuple - (sol_change, token_change, token_mint, token_symbol)
+                - sol_change: SOL变动量（正数=收入，负数=支出）
+                - token_change: Token变动量（正数=买入，负数=卖出）
         """
-        sol_change = 0.0
+        # 热路径：属性读成局部变量，每笔转账的字段只查一次
+        # （LOAD_FAST 与把钱包地址写死成常量的 LOAD_CONST 同样快，无需按钱包动态生成代码）
+        target = self.target_wallet
+        wsol = self.wsol_mint
         
+        sol_change: float = 0.0
         for transfer in native_transfers:
-            amount = transfer.get('amount', 0) / 1e9  # lamports转SOL
-            
-            if transfer.get('fromUserAccount') == self.target_wallet:
-                sol_change -= amount  # 转出（花钱）
-            elif transfer.get('toUserAccount') == self.target_wallet:
-                sol_change += amount  # 转入（收钱）
-        
-        return sol_change
-    
-    def _calculate_token_change(self, token_transfers: list) -> tuple:
-        """
-        计算 Token 余额变动
-        
-        参数:
-            token_transfers: list - 代币转账列表
-        
-        返回:
-            tuple - (token_change, token_mint, token_symbol)
-        """
-        token_change = 0.0
-        target_token_mint = None
-        target_token_symbol = "Unknown"
+            get = transfer.get
+            if get('fromUserAccount') == target:
+                sol_change -= get('amount', 0) / 1e9  # 转出（花钱），lamports转SOL
+            elif get('toUserAccount') == target:
+                sol_change += get('amount', 0) / 1e9  # 转入（收钱）
         
+        token_change: float = 0.0
+        target_token_mint: Optional[str] = None
         for transfer in token_transfers:
-            mint = transfer.get('mint')
+            get = transfer.get
+            mint = get('mint')
             
             # 忽略 WSOL 包装过程
-            if mint == self.wsol_mint:
+            if mint == wsol:
                 continue
             
-            if transfer.get('toUserAccount') == self.target_wallet:
+            if get('toUserAccount') == target:
                 # 收到 Token -> 买入
                 target_token_mint = mint
-                token_change += float(transfer.get('tokenAmount', 0) or 0)
-                target_token_symbol = transfer.get('mint', 'Unknown')[:8]  # 取前8位作为符号␊
-                ␊
-            elif transfer.get('fromUserAccount') == self.target_wallet:␊
+                token_change += float(get('tokenAmount', 0) or 0)
+            elif get('fromUserAccount') == target:
                 # 发出 Token -> 卖出
                 target_token_mint = mint
-                token_change -= float(transfer.get('tokenAmount', 0) or 0)
-                target_token_symbol = transfer.get('mint', 'Unknown')[:8]
+                token_change -= float(get('tokenAmount', 0) or 0)
+        
+        # 取 mint 前8位作为符号
+        target_token_symbol = target_token_mint[:8] if target_token_mint else "Unknown"
         
-        return token_change, target_token_mint, target_token_symbol
+        return sol_change, token_change, target_token_mint, target_token_symbol
     
     def _create_signal(self, sol_change: float, token_change: float, 
                       token_mint: str, token_symbol: str, 
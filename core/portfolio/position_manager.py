@@ -8,13 +8,39 @@
 - 持久化存储
 """
 
+import json
 import time
 import logging
-from typing import List, Optional, Dict
+import threading
+from queue import Queue, Empty, Full
+from dataclasses import fields
+from operator import attrgetter, mul
+from typing import Dict, Iterable, Optional
 from core.data_models import Position
 
 logger = logging.getLogger(__name__)
 
+_get_amount = attrgetter('amount')
+_get_current_price = attrgetter('current_price')
+
+# 持久化字段（与 Position 定义顺序一致），一次 attrgetter 调用取出全部字段值
+_FIELDS = tuple(f.name for f in fields(Position))
+_get_fields = attrgetter(*_FIELDS)
+
+
+def _encode_row(position: Position) -> str:
+    """
+    将单个持仓编码为 JSON 片段 `"mint": {...}`
+    
+    参数:
+        position: Position - 持仓对象
+    
+    返回:
+        str - 可直接拼接进 positions.json 顶层对象的片段
+    """
+    row = dict(zip(_FIELDS, _get_fields(position)))
+    return f"{json.dumps(position.mint)}: {json.dumps(row, ensure_ascii=False)}"
+
 
 class PositionManager:
     """
@@ -38,11 +64,23 @@ class PositionManager:
         self.storage = storage
         self.positions: Dict[str, Position] = {}  # {mint: Position对象}
         
+        # 写盘合并：修改持仓只记录脏 mint，由 flush() 按最小间隔统一落盘
+        self._dirty_mints = set()
+        self._last_save = 0.0
+        
+        # 已编码的持仓行 {mint: JSON片段}，保存时只重新编码有变动的行
+        self._rows: Dict[str, str] = {}
+        
+        # 异步写盘：单个后台线程负责写文件，队列只保留最新一份待写数据
+        self._write_queue = Queue(maxsize=1)
+        self._writer = threading.Thread(target=self._write_loop, name="PositionWriter", daemon=True)
+        
         # 启动时加载持仓数据
         self._load()
+        self._writer.start()
         logger.info(f"✅ 持仓管理器初始化完成，已加载 {len(self.positions)} 个持仓")
     
-    def add_position(self, mint: str, symbol: str, amount: float, cost: float):
+    def add_position(self, mint: str, symbol: str, amount: float, cost: float) -> Optional[Position]:
         """
         增加持仓（买入）
         
@@ -52,44 +90,41 @@ class PositionManager:
             amount: float - 买入数量
             cost: float - 买入总成本（USD）
         
+        返回:
+            Position - 更新后的持仓对象（买入数量无效时返回 None）
+        
         逻辑：
         - 如果是新持仓：直接创建
         - 如果已有持仓：累加数量，重新计算平均成本
         """
         if amount <= 0:
             logger.warning(f"⚠️ 买入数量无效: {amount}")
-            return
+            return None
         
         current_time = int(time.time())
         cost_per_token = cost / amount  # 本次买入的单价
         
-        if mint in self.positions:
+        position = self.positions.get(mint)
+        if position is not None:
             # 已有持仓，计算平均成本
-            old_position = self.positions[mint]
-            
             # 总成本 = 旧成本 + 新成本
-            total_cost = old_position.total_cost + cost
+            total_cost = position.total_cost + cost
             # 总数量 = 旧数量 + 新数量
-            total_amount = old_position.amount + amount
+            total_amount = position.amount + amount
             # 新的平均成本
             new_cost_basis = total_cost / total_amount
             
-            # 更新持仓
-            self.positions[mint] = Position(
-                mint=mint,
-                symbol=symbol,
-                amount=total_amount,
-                cost_basis=new_cost_basis,
-                total_cost=total_cost,
-                current_price=old_position.current_price,  # 保持当前价格
-                unrealized_pnl=0.0,  # 稍后计算
-                unrealized_pnl_percent=0.0,
-                entry_time=old_position.entry_time,  # 保持原入场时间
-                last_update_time=current_time
-            )
+            # 原地更新持仓（当前价格、入场时间保持不变）
+            position.symbol = symbol
+            position.amount = total_amount
+            position.cost_basis = new_cost_basis
+            position.total_cost = total_cost
+            position.last_update_time = current_time
             
             # 重新计算盈亏
-            self._recalculate_pnl(mint)
+            diff = position.current_price - new_cost_basis
+            position.unrealized_pnl = diff * total_amount
+            position.unrealized_pnl_percent = diff / new_cost_basis * 100 if new_cost_basis > 0 else 0.0
             
             logger.info(
                 f"📈 加仓 {symbol}: "
@@ -98,7 +133,7 @@ class PositionManager:
             )
         else:
             # 新持仓
-            self.positions[mint] = Position(
+            position = Position(
                 mint=mint,
                 symbol=symbol,
                 amount=amount,
@@ -110,14 +145,16 @@ class PositionManager:
                 entry_time=current_time,
                 last_update_time=current_time
             )
+            self.positions[mint] = position
             
             logger.info(
                 f"🆕 新建持仓 {symbol}: "
                 f"{amount:.4f} @ ${cost_per_token:.6f}"
             )
         
-        # 保存到storage
-        self._save()
+        # 标记待保存（由 flush() 统一落盘）
+        self._dirty_mints.add(mint)
+        return position
     
     def reduce_position(self, mint: str, amount: float, exit_price: float) -> float:
         """
@@ -136,12 +173,11 @@ class PositionManager:
         - 计算实现利润
         - 减少持仓数量（如果全部卖出则删除持仓）
         """
-        if mint not in self.positions:
+        position = self.positions.get(mint)
+        if position is None:
             logger.warning(f"⚠️ 持仓不存在: {mint}")
             return 0.0
         
-        position = self.positions[mint]
-        
         # 检查数量
         if amount > position.amount:
             logger.warning(
@@ -154,7 +190,7 @@ class PositionManager:
         cost_basis = position.cost_basis
         profit_per_token = exit_price - cost_basis
         realized_pnl = profit_per_token * amount
-        realized_pnl_percent = (profit_per_token / cost_basis) * 100 if cost_basis > 0 else 0
+        realized_pnl_percent = (profit_per_token / cost_basis) * 100 if cost_basis > 0 else 0.0
         
         logger.info(
             f"📉 卖出 {position.symbol}: "
@@ -169,27 +205,18 @@ class PositionManager:
             logger.info(f"🗑️ 清空持仓 {position.symbol}")
         else:
             # 部分卖出，减少数量
-            new_amount = position.amount - amount
-            new_total_cost = position.total_cost - (cost_basis * amount)
-            
-            self.positions[mint] = Position(
-                mint=mint,
-                symbol=position.symbol,
-                amount=new_amount,
-                cost_basis=cost_basis,  # 平均成本不变
-                total_cost=new_total_cost,
-                current_price=exit_price,  # 更新当前价格
-                unrealized_pnl=0.0,  # 稍后计算
-                unrealized_pnl_percent=0.0,
-                entry_time=position.entry_time,
-                last_update_time=int(time.time())
-            )
+            # 原地更新（平均成本不变，当前价格更新为卖出价）
+            position.amount -= amount
+            position.total_cost -= cost_basis * amount
+            position.current_price = exit_price
+            position.last_update_time = int(time.time())
             
-            # 重新计算未实现盈亏
-            self._recalculate_pnl(mint)
+            # 重新计算未实现盈亏（profit_per_token 即 当前价格 - 成本价格）
+            position.unrealized_pnl = profit_per_token * position.amount
+            position.unrealized_pnl_percent = realized_pnl_percent
         
-        # 保存到storage
-        self._save()
+        # 标记待保存（由 flush() 统一落盘）
+        self._dirty_mints.add(mint)
         
         return realized_pnl
     
@@ -205,53 +232,63 @@ class PositionManager:
         """
         return self.positions.get(mint)
     
-    def get_all_positions(self) -> List[Position]:
+    def get_all_positions(self) -> Iterable[Position]:
         """
-        获取所有持仓
+        获取所有持仓（只读视图，不复制）
         
         返回:
-            List[Position] - 持仓列表
+            Iterable[Position] - 持仓视图，遍历期间不要增删持仓（需要快照时自行 list()）
         """
-        return list(self.positions.values())
+        return self.positions.values()
     
-    def update_prices(self, price_dict: Dict[str, float]):
+    def update_prices(self, price_dict: Dict[str, float]) -> int:
         """
         批量更新持仓价格
         
         参数:
             price_dict: dict - {mint: current_price_usd}
         
+        返回:
+            int - 价格实际发生变化的持仓数
+        
         用途：
         - 定期更新所有持仓的当前价格
         - 重新计算未实现盈亏
         """
-        updated_count = 0
-        
-        for mint, current_price in price_dict.items():
-            if mint in self.positions:
-                position = self.positions[mint]
-                
-                # 更新价格
-                self.positions[mint] = Position(
-                    mint=position.mint,
-                    symbol=position.symbol,
-                    amount=position.amount,
-                    cost_basis=position.cost_basis,
-                    total_cost=position.total_cost,
-                    current_price=current_price,
-                    unrealized_pnl=0.0,  # 稍后计算
-                    unrealized_pnl_percent=0.0,
-                    entry_time=position.entry_time,
-                    last_update_time=int(time.time())
-                )
-                
-                # 重新计算盈亏
-                self._recalculate_pnl(mint)
-                updated_count += 1
-        
-        if updated_count > 0:
-            logger.debug(f"🔄 更新了 {updated_count} 个持仓的价格")
-            self._save()
+        now = int(time.time())
+        
+        # 只处理持有的代币：键视图取交集在 C 层完成，循环体内不再有未命中分支
+        held = price_dict.keys() & self.positions.keys()
+        if not held:
+            return 0
+        
+        positions = self.positions
+        changed = []
+        for mint in held:
+            position = positions[mint]
+            current_price = price_dict[mint]
+            
+            # 价格未变（预言机轮询快于链上价格变化时很常见）：不重算、不落盘
+            if position.current_price == current_price:
+                continue
+            
+            # 原地更新价格
+            position.current_price = current_price
+            position.last_update_time = now
+            
+            # 重新计算盈亏：(当前价格 - 成本价格) * 数量
+            cost_basis = position.cost_basis
+            diff = current_price - cost_basis
+            position.unrealized_pnl = diff * position.amount
+            position.unrealized_pnl_percent = diff / cost_basis * 100 if cost_basis > 0 else 0.0
+            changed.append(mint)
+        
+        if changed:
+            # 整批标记待保存
+            self._dirty_mints.update(changed)
+            logger.debug("🔄 更新了 %s 个持仓的价格", len(changed))
+        
+        return len(changed)
     
     def calculate_total_value(self) -> float:
         """
@@ -260,10 +297,9 @@ class PositionManager:
         返回:
             float - 总价值（USD）
         """
-        total = 0.0
-        for position in self.positions.values():
-            total += position.amount * position.current_price
-        return total
+        # 数量列 × 价格列逐项相乘再求和，整个循环在 C 层完成（sum/map/attrgetter/mul）
+        positions = self.positions.values()
+        return float(sum(map(mul, map(_get_amount, positions), map(_get_current_price, positions))))
     
     def get_position_count(self) -> int:
         """获取持仓数量"""
@@ -273,65 +309,109 @@ class PositionManager:
         """检查是否持有某个代币"""
         return mint in self.positions
     
-    # ========== 内部辅助方法 ==========
-    
-    def _recalculate_pnl(self, mint: str):
+    def flush(self, min_interval: float = 1.0) -> bool:
         """
-        重新计算单个持仓的盈亏
+        将待保存的持仓写入storage（距上次保存不足 min_interval 秒时跳过）
         
         参数:
-            mint: str - 代币地址
+            min_interval: float - 两次写盘的最小间隔（秒），传 0 强制立即写盘（停止时使用）
+        
+        返回:
+            bool - 本次是否执行了写盘
         """
-        if mint not in self.positions:
-            return
+        if not self._dirty_mints:
+            return False
         
-        position = self.positions[mint]
+        now = time.monotonic()
+        if now - self._last_save < min_interval:
+            return False
         
-        # 未实现盈亏 = (当前价格 - 成本价格) * 数量
-        unrealized_pnl = (position.current_price - position.cost_basis) * position.amount
+        self._last_save = now
+        self._save()
+        return True
+    
+    def close(self, timeout: float = 5.0):
+        """
+        停止时调用：写出所有未保存的持仓，等待后台写盘线程结束
         
-        # 未实现盈亏百分比
-        if position.cost_basis > 0:
-            unrealized_pnl_percent = ((position.current_price - position.cost_basis) / position.cost_basis) * 100
-        else:
-            unrealized_pnl_percent = 0.0
-        
-        # 更新持仓对象
-        self.positions[mint] = Position(
-            mint=position.mint,
-            symbol=position.symbol,
-            amount=position.amount,
-            cost_basis=position.cost_basis,
-            total_cost=position.total_cost,
-            current_price=position.current_price,
-            unrealized_pnl=unrealized_pnl,
-            unrealized_pnl_percent=unrealized_pnl_percent,
-            entry_time=position.entry_time,
-            last_update_time=position.last_update_time
-        )
+        参数:
+            timeout: float - 最长等待秒数
+        """
+        self.flush(min_interval=0)
+        if self._writer.is_alive():
+            self._write_queue.put(None)  # 哨兵：阻塞等待入队，保证排在最后一份数据之后
+            self._writer.join(timeout)
+    
+    # ========== 内部辅助方法 ==========
     
     def _save(self):
-        """保存所有持仓到storage"""
+        """保存所有持仓到storage（只重新序列化有变动的持仓）"""
         try:
-            # 将Position对象转换为字典
-            positions_dict = {}
-            for mint, position in self.positions.items():
-                positions_dict[mint] = {
-                    'mint': position.mint,
-                    'symbol': position.symbol,
-                    'amount': position.amount,
-                    'cost_basis': position.cost_basis,
-                    'total_cost': position.total_cost,
-                    'current_price': position.current_price,
-                    'unrealized_pnl': position.unrealized_pnl,
-                    'unrealized_pnl_percent': position.unrealized_pnl_percent,
-                    'entry_time': position.entry_time,
-                    'last_update_time': position.last_update_time
-                }
+            rows = self._rows
+            positions = self.positions
+            for mint in self._dirty_mints:
+                position = positions.get(mint)
+                if position is None:
+                    rows.pop(mint, None)  # 已清仓
+                else:
+                    rows[mint] = _encode_row(position)
+            self._dirty_mints.clear()
             
-            self.storage.save_positions(positions_dict)
-            logger.debug(f"💾 持仓已保存 ({len(positions_dict)} 个)")
+            # 拼接成完整 JSON 文档，storage 直接写入字节，不再逐个持仓重新 json.dump
+            payload = ("{\n" + ",\n".join(rows.values()) + "\n}").encode('utf-8')
+        
+        except Exception as e:
+            logger.error(f"❌ 保存持仓失败: {e}", exc_info=True)
+            return
         
+        if self._writer.is_alive():
+            # 交给后台线程写文件，交易路径不等待 IO
+            self._submit(payload)
+        else:
+            # 写盘线程已停止（close 之后）：同步写入
+            self._write(payload)
+    
+    def _submit(self, payload):
+        """
+        把待写数据放入写盘队列（队列里尚未写出的旧数据直接丢弃，只写最新一份）
+        
+        参数:
+            payload: bytes - 完整的 positions.json 内容
+        """
+        queue = self._write_queue
+        while True:
+            try:
+                queue.put_nowait(payload)
+                return
+            except Full:
+                try:
+                    queue.get_nowait()
+                    queue.task_done()
+                except Empty:
+                    pass  # 写盘线程刚好取走了，重试放入
+    
+    def _write_loop(self):
+        """后台写盘线程：依次写出队列中的数据，收到 None 后退出"""
+        queue = self._write_queue
+        while True:
+            payload = queue.get()
+            try:
+                if payload is None:
+                    return
+                self._write(payload)
+            finally:
+                queue.task_done()
+    
+    def _write(self, payload: bytes):
+        """
+        写入storage
+        
+        参数:
+            payload: bytes - 完整的 positions.json 内容
+        """
+        try:
+            self.storage.save_positions(payload)
+            logger.debug("💾 持仓已保存 (%s 字节)", len(payload))
         except Exception as e:
             logger.error(f"❌ 保存持仓失败: {e}", exc_info=True)
     
@@ -355,9 +435,12 @@ class PositionManager:
                     last_update_time=data['last_update_time']
                 )
             
+            self._rows = {mint: _encode_row(position) for mint, position in self.positions.items()}
+            
             if positions_dict:
                 logger.debug(f"📂 加载了 {len(positions_dict)} 个持仓")
         
         except Exception as e:
             logger.error(f"❌ 加载持仓失败: {e}", exc_info=True)
             self.positions = {}
+            self._rows = {}
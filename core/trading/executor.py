@@ -10,9 +10,13 @@
 """
 
 import time
+import atexit
 import random
 import logging
-from typing import Optional
+import threading
+from dataclasses import replace
+from queue import Queue, Empty
+from typing import List, Optional
 from core.data_models import ExecutionResult, TradingDecision, PriceInfo, TradeAction
 from core.portfolio.position_manager import PositionManager
 from storage.json_storage import JsonStorage
@@ -20,6 +24,27 @@ from config import SystemConfig, TradingConfig
 
 logger = logging.getLogger(__name__)
 
+# 余额检查点：交易后距上次保存超过该秒数，或累计交易数为该值的整数倍时写盘
+_BALANCE_CHECKPOINT_INTERVAL = 1.0
+_BALANCE_CHECKPOINT_TRADES = 16
+
+
+def _execution_math(price_usd: float, amount: float, slippage: float, is_buy: bool) -> tuple:
+    """
+    计算成交价格和成交金额（纯数值计算，不涉及余额、持仓和存储）
+    
+    参数:
+        price_usd: float - 报价（USD/token）
+        amount: float - 成交数量
+        slippage: float - 滑点比例
+        is_buy: bool - 买入时价格上浮，卖出时价格下浮
+    
+    返回:
+        tuple - (executed_price, notional)，notional 为买入花费或卖出收入（USD）
+    """
+    executed_price = price_usd * (1 + slippage) if is_buy else price_usd * (1 - slippage)
+    return executed_price, executed_price * amount
+
 
 class VirtualExecutor:
     """
@@ -32,6 +57,12 @@ class VirtualExecutor:
     - 维护虚拟余额
     - 记录完整交易数据
     """
+    __slots__ = (
+        'position_manager', 'storage', 'balance', 'session_id',
+        '_slippage_min', '_slippage_span',
+        '_balance_dirty', '_last_balance_save',
+        '_trade_seq', '_log_queue', '_log_writer',
+    )
     
     def __init__(self, position_manager: PositionManager, storage: JsonStorage):
         """
@@ -51,13 +82,30 @@ class VirtualExecutor:
         if self.balance == 0.0:
             self.balance = TradingConfig.INITIAL_BALANCE
             self.storage.save_balance(self.balance)
-            logger.info(f"💰 初始化虚拟余额: ${self.balance:.2f}")
+            logger.info("💰 初始化虚拟余额: $%.2f", self.balance)
         else:
-            logger.info(f"💰 加载虚拟余额: ${self.balance:.2f}")
+            logger.info("💰 加载虚拟余额: $%.2f", self.balance)
         
         # 加载会话信息
         self.session_id = self.storage.get_current_session()
-        logger.info(f"📋 当前会话: {self.session_id}")
+        logger.info("📋 当前会话: %s", self.session_id)
+        
+        # 滑点区间：启动时取一次配置，每笔交易只做一次 C 层 random() 调用
+        self._slippage_min = SystemConfig.SLIPPAGE_MIN
+        self._slippage_span = SystemConfig.SLIPPAGE_MAX - SystemConfig.SLIPPAGE_MIN
+        
+        # 余额以内存为准，交易后按检查点写盘（入金/出金/重置仍立即写盘）
+        self._balance_dirty = False
+        self._last_balance_save = time.monotonic()
+        atexit.register(self._flush_balance)
+        
+        # 交易序号：启动时读一次已有交易数，之后在内存中递增
+        self._trade_seq = len(self.storage.load_trades())
+        
+        # 交易记录/余额历史是只追加的审计数据：执行路径只入队，由后台线程批量写盘
+        self._log_queue = Queue()
+        self._log_writer = threading.Thread(target=self._log_loop, name="TradeLogWriter", daemon=True)
+        self._log_writer.start()
         
         logger.info("✅ 虚拟执行器初始化完成")
     
@@ -83,6 +131,31 @@ class VirtualExecutor:
         else:
             return self._create_error_result(decision, f"未知的交易动作: {decision.action}")
     
+    def execute_batch(self, decisions: List[TradingDecision], price_infos: List[PriceInfo]) -> List[ExecutionResult]:
+        """
+        批量执行虚拟交易（回测/重放场景）
+        
+        参数:
+            decisions: List[TradingDecision] - 交易决策（按时间顺序）
+            price_infos: List[PriceInfo] - 与 decisions 一一对应的价格信息
+        
+        返回:
+            List[ExecutionResult] - 与 decisions 一一对应的执行结果
+        
+        说明：
+        - 每笔交易仍走 execute()，余额、持仓、统计逐笔在内存中更新
+        - 余额和会话统计在 storage.batch() 内暂存，整批结束时每个文件只写一次
+        - 交易记录和余额历史由后台写盘线程批量追加，持仓由 PositionManager.flush 合并落盘
+        """
+        if len(decisions) != len(price_infos):
+            raise ValueError(f"decisions 与 price_infos 数量不一致: {len(decisions)} != {len(price_infos)}")
+        
+        with self.storage.batch():
+            return [
+                self.execute(decision, price_info)
+                for decision, price_info in zip(decisions, price_infos)
+            ]
+    
     def execute_buy(self, decision: TradingDecision, price_info: PriceInfo) -> ExecutionResult:
         """
         执行虚拟买入
@@ -94,56 +167,62 @@ class VirtualExecutor:
         返回:
             ExecutionResult - 执行结果
         """
+        position_manager = self.position_manager
+        
         # 计算滑点
         slippage_percent = self._calculate_slippage(price_info.liquidity)
         slippage_bps = int(slippage_percent * 10000)
         
-        # 实际执行价格（买入时价格变高）
-        executed_price = price_info.price_usd * (1 + slippage_percent)
-        
-        # 计算实际数量
+        # 实际数量
         executed_amount = decision.amount
         
-        # 计算实际成本
-        actual_cost = executed_price * executed_amount
+        # 实际执行价格（买入时价格变高）和实际成本
+        executed_price, actual_cost = _execution_math(
+            price_info.price_usd, executed_amount, slippage_percent, is_buy=True
+        )
         
         # 检查余额是否足够
         if actual_cost > self.balance:
             logger.warning(
-                f"⚠️ 余额不足: 需要 ${actual_cost:.2f}, 当前 ${self.balance:.2f}"
+                "⚠️ 余额不足: 需要 $%.2f, 当前 $%.2f",
+                actual_cost, self.balance
             )
             return self._create_error_result(
                 decision, 
                 f"余额不足（需要${actual_cost:.2f}，当前${self.balance:.2f}）"
             )
         
-        # 记录执行前状态
+        # 记录执行前状态（持仓对象会被原地更新，复制一份执行前快照）
         balance_before = self.balance
-        position_before = self.position_manager.get_position(decision.token_mint)
+        position_before = position_manager.get_position(decision.token_mint)
+        if position_before is not None:
+            position_before = replace(position_before)
         
         # 扣除余额
         self.balance -= actual_cost
         
-        # 更新持仓
-        self.position_manager.add_position(
+        # 更新持仓（返回更新后的持仓，无需再查一次）
+        position_after = position_manager.add_position(
             mint=decision.token_mint,
             symbol=decision.token_symbol,
             amount=executed_amount,
             cost=actual_cost
         )
         
-        # 获取更新后的持仓
-        position_after = self.position_manager.get_position(decision.token_mint)
+        # 余额待保存（交易结束时按检查点写盘）
+        self._balance_dirty = True
         
-        # 保存余额
-        self.storage.save_balance(self.balance)
+        # 成交时间（交易ID、交易记录、余额历史、返回结果共用）
+        now = int(time.time())
+        local_now = time.localtime(now)
         
         # 生成交易ID
-        trade_id = self._generate_trade_id()
+        trade_id = self._generate_trade_id(local_now)
         
         # 记录余额历史
-        position_value = self.position_manager.calculate_total_value()
-        self.storage.save_balance_history_entry(
+        position_value = position_manager.calculate_total_value()
+        self._record_balance_history(
+            timestamp=now,
             balance=self.balance,
             change=-actual_cost,
             reason="buy",
@@ -155,6 +234,8 @@ class VirtualExecutor:
         # 保存完整的交易记录
         self._save_detailed_trade(
             trade_id=trade_id,
+            now=now,
+            local_now=local_now,
             action="BUY",
             decision=decision,
             price_info=price_info,
@@ -170,12 +251,16 @@ class VirtualExecutor:
         )
         
         # 更新会话统计
-        self._update_session_stats_after_buy()
+        self._update_session_stats_after_buy(position_value)
+        self._checkpoint_balance()
         
         logger.info(
-            f"✅ 买入成功: {executed_amount:.4f} {decision.token_symbol} "
-            f"@ ${executed_price:.6f} (滑点 {slippage_percent*100:.2f}%), "
-            f"花费 ${actual_cost:.2f}, 余额 ${self.balance:.2f}"
+            "✅ 买入成功: %.4f %s "
+            "@ $%.6f (滑点 %.2f%%), "
+            "花费 $%.2f, 余额 $%.2f",
+            executed_amount, decision.token_symbol,
+            executed_price, slippage_percent*100,
+            actual_cost, self.balance
         )
         
         # 返回执行结果
@@ -190,7 +275,7 @@ class VirtualExecutor:
             slippage=slippage_percent,
             balance_before=balance_before,
             balance_after=self.balance,
-            timestamp=int(time.time())
+            timestamp=now
         )
     
     def execute_sell(self, decision: TradingDecision, price_info: PriceInfo) -> ExecutionResult:
@@ -204,17 +289,20 @@ class VirtualExecutor:
         返回:
             ExecutionResult - 执行结果
         """
+        position_manager = self.position_manager
+        
         # 检查持仓
-        position = self.position_manager.get_position(decision.token_mint)
+        position = position_manager.get_position(decision.token_mint)
         if not position:
-            logger.warning(f"⚠️ 没有持仓: {decision.token_symbol}")
+            logger.warning("⚠️ 没有持仓: %s", decision.token_symbol)
             return self._create_error_result(decision, "没有持仓")
         
         # 检查持仓数量
         if decision.amount > position.amount:
             logger.warning(
-                f"⚠️ 持仓不足: 尝试卖出 {decision.amount:.4f}, "
-                f"实际持有 {position.amount:.4f}"
+                "⚠️ 持仓不足: 尝试卖出 %.4f, "
+                "实际持有 %.4f",
+                decision.amount, position.amount
             )
             return self._create_error_result(
                 decision, 
@@ -225,47 +313,51 @@ class VirtualExecutor:
         slippage_percent = self._calculate_slippage(price_info.liquidity)
         slippage_bps = int(slippage_percent * 10000)
         
-        # 实际执行价格（卖出时价格变低）
-        executed_price = price_info.price_usd * (1 - slippage_percent)
-        
         # 实际数量
         executed_amount = decision.amount
         
-        # 实际收入
-        actual_income = executed_price * executed_amount
+        # 实际执行价格（卖出时价格变低）和实际收入
+        executed_price, actual_income = _execution_math(
+            price_info.price_usd, executed_amount, slippage_percent, is_buy=False
+        )
         
-        # 记录执行前状态
+        # 记录执行前状态（持仓对象会被原地更新，复制一份执行前快照）
         balance_before = self.balance
-        position_before = self.position_manager.get_position(decision.token_mint)
+        position_before = replace(position)
         
         # 增加余额
         self.balance += actual_income
         
         # 减少持仓并计算利润
-        realized_pnl = self.position_manager.reduce_position(
+        realized_pnl = position_manager.reduce_position(
             mint=decision.token_mint,
             amount=executed_amount,
             exit_price=executed_price
         )
         
         # 获取更新后的持仓（可能为None）
-        position_after = self.position_manager.get_position(decision.token_mint)
+        position_after = position_manager.get_position(decision.token_mint)
         
         # 计算盈亏百分比
         pnl_percent = (executed_price - position_before.cost_basis) / position_before.cost_basis if position_before.cost_basis > 0 else 0.0
         
+        # 成交时间（持仓时长、交易ID、交易记录、余额历史、返回结果共用）
+        now = int(time.time())
+        local_now = time.localtime(now)
+        
         # 计算持仓时间
-        holding_time = int(time.time()) - position_before.entry_time
+        holding_time = now - position_before.entry_time
         
-        # 保存余额
-        self.storage.save_balance(self.balance)
+        # 余额待保存（交易结束时按检查点写盘）
+        self._balance_dirty = True
         
         # 生成交易ID
-        trade_id = self._generate_trade_id()
+        trade_id = self._generate_trade_id(local_now)
         
         # 记录余额历史
-        position_value = self.position_manager.calculate_total_value()
-        self.storage.save_balance_history_entry(
+        position_value = position_manager.calculate_total_value()
+        self._record_balance_history(
+            timestamp=now,
             balance=self.balance,
             change=actual_income,
             reason="sell",
@@ -277,6 +369,8 @@ class VirtualExecutor:
         # 保存完整的交易记录
         self._save_detailed_trade(
             trade_id=trade_id,
+            now=now,
+            local_now=local_now,
             action="SELL",
             decision=decision,
             price_info=price_info,
@@ -295,13 +389,18 @@ class VirtualExecutor:
         )
         
         # 更新会话统计
-        self._update_session_stats_after_sell(realized_pnl)
+        self._update_session_stats_after_sell(realized_pnl, position_value)
+        self._checkpoint_balance()
         
         logger.info(
-            f"✅ 卖出成功: {executed_amount:.4f} {decision.token_symbol} "
-            f"@ ${executed_price:.6f} (滑点 {slippage_percent*100:.2f}%), "
-            f"收入 ${actual_income:.2f}, 利润 ${realized_pnl:.2f} ({pnl_percent*100:+.2f}%), "
-            f"余额 ${self.balance:.2f}"
+            "✅ 卖出成功: %.4f %s "
+            "@ $%.6f (滑点 %.2f%%), "
+            "收入 $%.2f, 利润 $%.2f (%+.2f%%), "
+            "余额 $%.2f",
+            executed_amount, decision.token_symbol,
+            executed_price, slippage_percent*100,
+            actual_income, realized_pnl, pnl_percent*100,
+            self.balance
         )
         
         # 返回执行结果
@@ -316,7 +415,7 @@ class VirtualExecutor:
             slippage=slippage_percent,
             balance_before=balance_before,
             balance_after=self.balance,
-            timestamp=int(time.time()),
+            timestamp=now,
             realized_pnl=realized_pnl
         )
     
@@ -338,7 +437,8 @@ class VirtualExecutor:
         
         balance_before = self.balance
         self.balance += amount
-        self.storage.save_balance(self.balance)
+        self._balance_dirty = True
+        self._flush_balance()
         
         # 记录操作
         self.storage.record_operation(
@@ -351,7 +451,7 @@ class VirtualExecutor:
         
         # 记录余额历史
         position_value = self.position_manager.calculate_total_value()
-        self.storage.save_balance_history_entry(
+        self._record_balance_history(
             balance=self.balance,
             change=amount,
             reason="deposit",
@@ -359,7 +459,7 @@ class VirtualExecutor:
             note=note
         )
         
-        logger.info(f"💰 虚拟入金: ${amount:.2f}, 余额 ${self.balance:.2f}")
+        logger.info("💰 虚拟入金: $%.2f, 余额 $%.2f", amount, self.balance)
         return True
     
     def withdraw(self, amount: float, note: str = "虚拟出金"):
@@ -379,12 +479,13 @@ class VirtualExecutor:
             return False
         
         if amount > self.balance:
-            logger.warning(f"⚠️ 余额不足: 需要 ${amount:.2f}, 当前 ${self.balance:.2f}")
+            logger.warning("⚠️ 余额不足: 需要 $%.2f, 当前 $%.2f", amount, self.balance)
             return False
         
         balance_before = self.balance
         self.balance -= amount
-        self.storage.save_balance(self.balance)
+        self._balance_dirty = True
+        self._flush_balance()
         
         # 记录操作
         self.storage.record_operation(
@@ -397,7 +498,7 @@ class VirtualExecutor:
         
         # 记录余额历史
         position_value = self.position_manager.calculate_total_value()
-        self.storage.save_balance_history_entry(
+        self._record_balance_history(
             balance=self.balance,
             change=-amount,
             reason="withdraw",
@@ -405,7 +506,7 @@ class VirtualExecutor:
             note=note
         )
         
-        logger.info(f"💸 虚拟出金: ${amount:.2f}, 余额 ${self.balance:.2f}")
+        logger.info("💸 虚拟出金: $%.2f, 余额 $%.2f", amount, self.balance)
         return True
     
     def reset_session(self, reason: str = "手动重置"):
@@ -415,19 +516,24 @@ class VirtualExecutor:
         参数:
             reason: str - 重置原因
         """
-        logger.info(f"🔄 重置会话: {reason}")
+        logger.info("🔄 重置会话: %s", reason)
+        
+        # 先把积压的交易记录/余额历史写进旧会话，storage 重置后文件路径会切到新会话
+        self.flush()
         
         # 调用storage的重置方法
         new_session_id = self.storage.reset_session(reason)
         
         # 重新初始化余额
         self.balance = TradingConfig.INITIAL_BALANCE
-        self.storage.save_balance(self.balance)
+        self._balance_dirty = True
+        self._flush_balance()
         
-        # 更新会话ID
+        # 更新会话ID（新会话交易序号从头开始）
         self.session_id = new_session_id
+        self._trade_seq = 0
         
-        logger.info(f"✅ 会话重置完成，新余额: ${self.balance:.2f}")
+        logger.info("✅ 会话重置完成，新余额: $%.2f", self.balance)
     
     def _calculate_slippage(self, liquidity: float) -> float:
         """
@@ -439,36 +545,47 @@ class VirtualExecutor:
         返回:
             float - 滑点百分比
         """
-        min_bps = SystemConfig.SLIPPAGE_MIN_BPS
-        max_bps = SystemConfig.SLIPPAGE_MAX_BPS
-        
-        slippage_bps = random.uniform(min_bps, max_bps)
-        slippage_percent = slippage_bps / 10000
-        
-        return slippage_percent
+        # 等价于 random.uniform(min, max)，省去 Python 层函数调用和两次配置属性查找
+        return self._slippage_min + self._slippage_span * random.random()
     
-    def _generate_trade_id(self) -> str:
+    def _generate_trade_id(self, local_now: Optional[time.struct_time] = None) -> str:
         """
         生成交易ID
         
+        参数:
+            local_now: struct_time - 成交时间（本地时间，默认取当前时间）
+        
         返回:
             str - 交易ID (时间戳_序号)
         """
-        timestamp = time.strftime("%Y%m%d_%H%M%S")
-        # 从当前会话的交易记录中获取序号
-        trades = self.storage.load_trades()
-        sequence = len(trades) + 1
-        return f"{timestamp}_{sequence:03d}"
+        timestamp = time.strftime("%Y%m%d_%H%M%S", local_now or time.localtime())
+        # 当前会话内的交易序号
+        self._trade_seq += 1
+        return f"{timestamp}_{self._trade_seq:03d}"
     
-    def _save_detailed_trade(self, trade_id, action, decision, price_info, 
+    def _save_detailed_trade(self, trade_id, now, local_now, action, decision, price_info, 
                             executed_price, executed_amount, cost, slippage, slippage_bps,
                             balance_before, balance_after, position_before, position_after,
                             realized_pnl=None, pnl_percent=None, holding_time=None):
         """
         保存完整的交易记录
         
-        按照任务2.3.1定义的完整格式保存
+        按照任务2.3.1定义的完整格式保存（now / local_now 为成交时间戳及其本地时间）
         """
+        # 持仓前后状态（无持仓记为 0）
+        if position_before is not None:
+            before_amount = position_before.amount
+            before_cost = position_before.cost_basis
+        else:
+            before_amount = before_cost = 0.0
+        
+        if position_after is not None:
+            after_amount = position_after.amount
+            after_cost = position_after.cost_basis
+            after_total_cost = position_after.total_cost
+        else:
+            after_amount = after_cost = after_total_cost = 0.0
+        
         # 构造完整的交易记录
         trade_data = {
             "trade_id": trade_id,
@@ -476,8 +593,8 @@ class VirtualExecutor:
             
             "basic_info": {
                 "action": action,
-                "timestamp": int(time.time()),
-                "datetime": time.strftime("%Y-%m-%d %H:%M:%S")
+                "timestamp": now,
+                "datetime": time.strftime("%Y-%m-%d %H:%M:%S", local_now)
             },
             
             "token": {
@@ -527,13 +644,13 @@ class VirtualExecutor:
             
             "position": {
                 "before": {
-                    "amount": position_before.amount if position_before else 0.0,
-                    "avg_cost": position_before.cost_basis if position_before else 0.0
+                    "amount": before_amount,
+                    "avg_cost": before_cost
                 },
                 "after": {
-                    "amount": position_after.amount if position_after else 0.0,
-                    "avg_cost": position_after.cost_basis if position_after else 0.0,
-                    "total_cost": position_after.total_cost if position_after else 0.0
+                    "amount": after_amount,
+                    "avg_cost": after_cost,
+                    "total_cost": after_total_cost
                 }
             },
             
@@ -541,50 +658,150 @@ class VirtualExecutor:
                 "realized_pnl": realized_pnl,
                 "pnl_percent": pnl_percent,
                 "holding_time": holding_time,
-                "entry_price": position_before.cost_basis if position_before else 0.0,
+                "entry_price": before_cost,
                 "exit_price": executed_price if action == "SELL" else None
             }
         }
         
-        # 保存交易记录
-        self.storage.save_trade(trade_data)
+        # 保存交易记录（异步写盘）
+        self._submit_log('trade', trade_data)
     
-    def _update_session_stats_after_buy(self):
-        """买入后更新会话统计"""
+    def _checkpoint_balance(self):
+        """交易结束时调用：到达检查点（时间间隔或交易笔数）才写余额"""
+        if not self._balance_dirty:
+            return
+        
+        if (time.monotonic() - self._last_balance_save >= _BALANCE_CHECKPOINT_INTERVAL
+                or self._trade_seq % _BALANCE_CHECKPOINT_TRADES == 0):
+            self._flush_balance()
+    
+    def _flush_balance(self):
+        """有未保存的余额变化时立即写盘"""
+        if not self._balance_dirty:
+            return
+        
+        self.storage.save_balance(self.balance)
+        self._balance_dirty = False
+        self._last_balance_save = time.monotonic()
+    
+    def _record_balance_history(self, **entry):
+        """
+        记录余额历史（异步写盘，参数同 storage.save_balance_history_entry）
+        """
+        entry.setdefault('timestamp', int(time.time()))  # 按发生时间记录，而不是写盘时间
+        self._submit_log('balance_history', entry)
+    
+    def _submit_log(self, kind: str, data: dict):
+        """
+        提交一条待写日志
+        
+        参数:
+            kind: str - 'trade' 或 'balance_history'
+            data: dict - 记录内容
+        """
+        if self._log_writer.is_alive():
+            self._log_queue.put((kind, data))
+        else:
+            # 写盘线程已停止（close 之后）：同步写入
+            self._write_logs([(kind, data)])
+    
+    def _log_loop(self):
+        """后台写盘线程：取出队列中积压的全部记录，每种文件一次写完；收到停止哨兵后退出"""
+        queue = self._log_queue
+        while True:
+            items = [queue.get()]
+            while True:
+                try:
+                    items.append(queue.get_nowait())
+                except Empty:
+                    break
+            
+            try:
+                self._write_logs(items)
+            except Exception as e:
+                logger.error("❌ 写入交易日志失败: %s", e, exc_info=True)
+            finally:
+                for _ in items:
+                    queue.task_done()
+            
+            if any(kind is None for kind, _ in items):
+                return
+    
+    def _write_logs(self, items: list):
+        """
+        批量写入交易记录和余额历史
+        
+        参数:
+            items: list - [(kind, data), ...]，按发生顺序排列
+        """
+        self.storage.append_trades([data for kind, data in items if kind == 'trade'])
+        self.storage.append_balance_history([data for kind, data in items if kind == 'balance_history'])
+    
+    def flush(self):
+        """保存余额，并等待已提交的交易记录/余额历史全部写盘"""
+        self._flush_balance()
+        self._log_queue.join()
+    
+    def close(self, timeout: float = 5.0):
+        """
+        停止时调用：写完积压的日志并停止后台写盘线程
+        
+        参数:
+            timeout: float - 最长等待秒数
+        """
+        self._flush_balance()
+        if self._log_writer.is_alive():
+            self._log_queue.put((None, None))  # 停止哨兵，排在所有记录之后
+            self._log_writer.join(timeout)
+    
+    def _update_session_stats_after_buy(self, position_value: float):
+        """
+        买入后更新会话统计
+        
+        参数:
+            position_value: float - 成交后的持仓总价值（调用方已算好，不再重复遍历持仓）
+        """
         metadata = self.storage.load_session_metadata()
         if not metadata:
             return
         
+        stats = metadata['statistics']
+        balance = self.balance
+        
         stats_update = {
-            "total_trades": metadata['statistics']['total_trades'] + 1,
-            "buy_trades": metadata['statistics']['buy_trades'] + 1,
-            "current_balance": self.balance,
-            "current_position_value": self.position_manager.calculate_total_value(),
-            "current_total_value": self.balance + self.position_manager.calculate_total_value(),
-            "current_positions": self.position_manager.get_position_count()
+            "total_trades": stats['total_trades'] + 1,
+            "buy_trades": stats['buy_trades'] + 1,
+            "current_balance": balance,
+            "current_position_value": position_value,
+            "current_total_value": balance + position_value,
+            "current_positions": self.position_manager.get_position_count(),
+            # 更新最大/最小余额
+            "max_balance": max(stats['max_balance'], balance),
+            "min_balance": min(stats['min_balance'], balance)
         }
         
-        # 更新最大/最小余额
-        if self.balance > metadata['statistics']['max_balance']:
-            stats_update['max_balance'] = self.balance
-        if self.balance < metadata['statistics']['min_balance']:
-            stats_update['min_balance'] = self.balance
-        
         self.storage.update_session_statistics(stats_update)
     
-    def _update_session_stats_after_sell(self, realized_pnl):
-        """卖出后更新会话统计"""
+    def _update_session_stats_after_sell(self, realized_pnl, position_value: float):
+        """
+        卖出后更新会话统计
+        
+        参数:
+            realized_pnl: float - 实现利润
+            position_value: float - 成交后的持仓总价值（调用方已算好，不再重复遍历持仓）
+        """
         metadata = self.storage.load_session_metadata()
         if not metadata:
             return
         
-        # 判断盈亏
-        is_winning = realized_pnl > 0
+        # 判断盈亏（盈利计 1，否则计 0）
+        win = int(realized_pnl > 0)
         
         stats = metadata['statistics']
+        balance = self.balance
         total_trades = stats['total_trades'] + 1
-        winning_trades = stats['winning_trades'] + (1 if is_winning else 0)
-        losing_trades = stats['losing_trades'] + (0 if is_winning else 1)
+        winning_trades = stats['winning_trades'] + win
+        losing_trades = stats['losing_trades'] + (1 - win)
         
         stats_update = {
             "total_trades": total_trades,
@@ -593,22 +810,19 @@ class VirtualExecutor:
             "losing_trades": losing_trades,
             "win_rate": winning_trades / total_trades if total_trades > 0 else 0.0,
             "total_pnl": stats['total_pnl'] + realized_pnl,
-            "current_balance": self.balance,
-            "current_position_value": self.position_manager.calculate_total_value(),
-            "current_total_value": self.balance + self.position_manager.calculate_total_value(),
-            "current_positions": self.position_manager.get_position_count()
+            "current_balance": balance,
+            "current_position_value": position_value,
+            "current_total_value": balance + position_value,
+            "current_positions": self.position_manager.get_position_count(),
+            # 更新最大/最小余额
+            "max_balance": max(stats['max_balance'], balance),
+            "min_balance": min(stats['min_balance'], balance)
         }
         
         # 更新总收益率
         initial_balance = metadata['initial_balance']
         stats_update['total_return'] = (stats_update['current_total_value'] - initial_balance) / initial_balance
         
-        # 更新最大/最小余额
-        if self.balance > stats['max_balance']:
-            stats_update['max_balance'] = self.balance
-        if self.balance < stats['min_balance']:
-            stats_update['min_balance'] = self.balance
-        
         self.storage.update_session_statistics(stats_update)
     
     def get_balance(self) -> float:
@@ -622,6 +836,7 @@ class VirtualExecutor:
     
     def _create_skip_result(self, decision: TradingDecision, reason: str) -> ExecutionResult:
         """创建跳过执行的结果"""
+        balance = self.balance
         return ExecutionResult(
             success=False,
             action=TradeAction.SKIP,
@@ -631,15 +846,15 @@ class VirtualExecutor:
             executed_amount=0.0,
             cost=0.0,
             slippage=0.0,
-            balance_before=self.balance,
-            balance_after=self.balance,
+            balance_before=balance,
+            balance_after=balance,
             timestamp=int(time.time()),
             error_message=reason
         )
     
     def _create_error_result(self, decision: TradingDecision, error_message: str) -> ExecutionResult:
         """创建错误结果"""
-        logger.error(f"❌ 执行失败: {error_message}")
+        logger.error("❌ 执行失败: %s", error_message)
         
         return ExecutionResult(
             success=False,
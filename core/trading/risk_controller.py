@@ -139,32 +139,30 @@ class RiskController:
         if not positions:
             return risk_actions
         
-        # 逐个检查
+        # 整轮检查共用一个时间戳；阈值与开关提前取到局部变量
+        now = int(time.time())
+        check_sl = self.enable_stop_loss
+        check_tp = self.enable_take_profit
+        stop_loss = self.stop_loss_percent
+        take_profit = self.take_profit_percent
+        # 时间止损：持仓时长 >= max_hold_time 等价于 entry_time <= entry_cutoff
+        entry_cutoff = now - self.max_hold_time
+        
+        # 先用纯比较筛出触发的持仓，只对（通常很少的）触发项构造 RiskAction 和打日志
+        # 优先级：止损 > 止盈 > 时间止损（时间止损归入止损功能）
         for position in positions:
-            # 1. 检查止损（如果启用）
-            if self.enable_stop_loss:
-                action = self._check_stop_loss(position)
-                if action:
-                    risk_actions.append(action)
-                    continue
+            pnl_percent = position.unrealized_pnl_percent
             
-            # 2. 检查止盈（如果启用）
-            if self.enable_take_profit:
-                action = self._check_take_profit(position)
-                if action:
-                    risk_actions.append(action)
-                    continue
-            
-            # 3. 检查时间止损（如果启用）
-            if self.enable_stop_loss:  # 时间止损归入止损功能
-                action = self._check_time_stop(position)
-                if action:
-                    risk_actions.append(action)
-                    continue
+            if check_sl and pnl_percent <= stop_loss:
+                risk_actions.append(self._check_stop_loss(position, now))
+            elif check_tp and pnl_percent >= take_profit:
+                risk_actions.append(self._check_take_profit(position, now))
+            elif check_sl and position.entry_time <= entry_cutoff:
+                risk_actions.append(self._check_time_stop(position, now))
         
         return risk_actions
     
-    def _check_stop_loss(self, position: Position) -> Optional[RiskAction]:
+    def _check_stop_loss(self, position: Position, now: int) -> Optional[RiskAction]:
         """检查止损"""
         pnl_percent = position.unrealized_pnl_percent
         
@@ -180,13 +178,13 @@ class RiskController:
                 symbol=position.symbol,
                 reason=f"亏损达到止损线 ({pnl_percent*100:.2f}%)",
                 current_pnl_percent=pnl_percent,
-                holding_duration=position.holding_duration,
+                holding_duration=position.holding_duration_at(now),
                 suggested_amount=position.amount
             )
         
         return None
     
-    def _check_take_profit(self, position: Position) -> Optional[RiskAction]:
+    def _check_take_profit(self, position: Position, now: int) -> Optional[RiskAction]:
         """检查止盈"""
         pnl_percent = position.unrealized_pnl_percent
         
@@ -202,15 +200,15 @@ class RiskController:
                 symbol=position.symbol,
                 reason=f"盈利达到止盈线 ({pnl_percent*100:.2f}%)",
                 current_pnl_percent=pnl_percent,
-                holding_duration=position.holding_duration,
+                holding_duration=position.holding_duration_at(now),
                 suggested_amount=position.amount
             )
         
         return None
     
-    def _check_time_stop(self, position: Position) -> Optional[RiskAction]:
+    def _check_time_stop(self, position: Position, now: int) -> Optional[RiskAction]:
         """检查时间止损"""
-        holding_duration = position.holding_duration
+        holding_duration = position.holding_duration_at(now)
         
         if holding_duration >= self.max_hold_time:
             logger.warning(
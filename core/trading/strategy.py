@@ -46,6 +46,7 @@ class TradingStrategy:
         self.min_market_cap = TradingConfig.MIN_MARKET_CAP
         self.max_market_cap = TradingConfig.MAX_MARKET_CAP
         self.blacklist_tokens = TradingConfig.BLACKLIST_TOKENS
+        self._filter = TradingConfig.build_filter()
         self.trade_ratio = TradingConfig.TRADE_RATIO
         self.min_trade_amount = TradingConfig.MIN_TRADE_AMOUNT
         
@@ -189,27 +190,8 @@ class TradingStrategy:
         返回:
             tuple - (是否通过, 原因)
         """
-        # 1. 黑名单检查
-        if signal.token_mint in self.blacklist_tokens:
-            return False, f"代币在黑名单中: {signal.token_symbol}"
-        
-        # 2. 流动性检查
-        if self.min_liquidity > 0:
-            if price_info.liquidity < self.min_liquidity:
-                return False, f"流动性不足: ${price_info.liquidity:,.0f} < ${self.min_liquidity:,.0f}"
-        
-        # 3. 市值检查（最小值）
-        if self.min_market_cap > 0:
-            if price_info.market_cap < self.min_market_cap:
-                return False, f"市值过低: ${price_info.market_cap:,.0f} < ${self.min_market_cap:,.0f}"
-        
-        # 4. 市值检查（最大值）
-        if self.max_market_cap < float('inf'):
-            if price_info.market_cap > self.max_market_cap:
-                return False, f"市值过高: ${price_info.market_cap:,.0f} > ${self.max_market_cap:,.0f}"
-        
-        # 全部通过
-        return True, "通过所有筛选"
+        # 筛选函数在初始化/配置更新时构建，阈值已绑定
+        return self._filter(signal, price_info)
     
     def _calculate_buy_amount(self, price_info: PriceInfo, 
                              current_balance: float) -> tuple:
@@ -345,6 +327,7 @@ class TradingStrategy:
         self.min_market_cap = TradingConfig.MIN_MARKET_CAP
         self.max_market_cap = TradingConfig.MAX_MARKET_CAP
         self.blacklist_tokens = TradingConfig.BLACKLIST_TOKENS
+        self._filter = TradingConfig.build_filter()
         self.trade_ratio = TradingConfig.TRADE_RATIO
         self.min_trade_amount = TradingConfig.MIN_TRADE_AMOUNT
         
@@ -362,7 +345,7 @@ class TradingStrategy:
             "min_liquidity": self.min_liquidity,
             "min_market_cap": self.min_market_cap,
             "max_market_cap": self.max_market_cap,
-            "blacklist_tokens": self.blacklist_tokens,
+            "blacklist_tokens": sorted(self.blacklist_tokens),
             "trade_ratio": self.trade_ratio,
             "min_trade_amount": self.min_trade_amount
         }
@@ -153,8 +153,8 @@ class VirtualTradingSystem:
             self.total_transactions += len(new_transactions)
             logger.info(f"📨 发现 {len(new_transactions)} 笔新交易")
             
-            # 反转顺序（从旧到新）
-            transactions = list(reversed(new_transactions))
+            # poll 返回的交易已按从旧到新排列
+            transactions = new_transactions
             
             # 2.5. 保存原始交易到追踪地址交易记录（新增）
             from datetime import datetime
@@ -164,7 +164,8 @@ class VirtualTradingSystem:
             if processed_txs:
                 logger.info(f"✅ 已保存 {len(processed_txs)} 笔原始交易到追踪地址交易记录")
             
-            # 3. 解析交易信号
+            # 3. 解析交易信号（先收集整批信号，再统一交给协调器）
+            batch_signals = []
             for tx in transactions:
                 try:
                     # 解析信号
@@ -174,28 +175,30 @@ class VirtualTradingSystem:
                         logger.debug(f"   跳过非交易型交易: {tx.get('signature', 'N/A')[:8]}...")
                         continue
                     
-                    # 处理每个信号
                     for signal in signals:
                         logger.info(f"\n🔔 交易信号: {signal.action} {signal.token_symbol}")
-                        
-                        # 交易协调器处理
-                        result = self.coordinator.process_signal(signal)
-                        
-                        # 记录结果
-                        if result['success']:
-                            logger.info(f"✅ 交易执行成功")
-                        else:
-                            logger.info(f"⏭️ 跳过: {result['reason']}")
+                    batch_signals.extend(signals)
                 
                 except Exception as e:
                     logger.error(f"❌ 处理交易失败: {e}")
                     continue
             
+            # 交易协调器处理（整批价格并发预取，按顺序执行）
+            for result in self.coordinator.process_signals(batch_signals):
+                # 记录结果
+                if result.success:
+                    logger.info(f"✅ 交易执行成功")
+                else:
+                    logger.info(f"⏭️ 跳过: {result.reason}")
+            
             # 4. 检查持仓风控
             self._check_position_risks()
             
             # 5. 更新持仓价格
             self.coordinator.update_position_prices()
+            
+            # 6. 持仓落盘（本轮所有修改合并为一次写入）
+            self.coordinator.flush()
         
         except Exception as e:
             logger.error(f"❌ 扫描处理失败: {e}", exc_info=True)
@@ -228,6 +231,9 @@ class VirtualTradingSystem:
         logger.info("=" * 60)
         logger.info("🛑 系统正在停止...")
         
+        # 保存尚未落盘的持仓（等待后台写盘完成）
+        self.coordinator.close()
+        
         # 显示运行统计
         if self.start_time:
             runtime = datetime.now() - self.start_time
@@ -1,5 +1,6 @@
 import requests
 import time
+from requests.adapters import HTTPAdapter
 from utils.logger import logger
 
 class HeliusMonitor:
@@ -10,6 +11,11 @@ class HeliusMonitor:
         self.rpc_url = f"https://mainnet.helius-rpc.com/?api-key={api_key}"
         self.wsol_mint = "So11111111111111111111111111111111111111112"
         
+        # 所有线程（交易追踪、资产更新、价格更新）共用同一个 Session，
+        # 复用 keep-alive 连接，避免每次 RPC 都重新握手 TCP/TLS
+        self.session = requests.Session()
+        self.session.mount("https://", HTTPAdapter(pool_connections=16, pool_maxsize=32))
+        
     def get_recent_transactions(self, limit=10):
         """
         获取最近交易，并包含完整解析详情。
@@ -21,7 +27,7 @@ class HeliusMonitor:
                 "jsonrpc": "2.0", "id": 1, "method": "getSignaturesForAddress",
                 "params": [self.target_wallet, {"limit": int(limit)}]
             }
-            response = requests.post(self.rpc_url, json=payload, timeout=10)
+            response = self.session.post(self.rpc_url, json=payload, timeout=10)
             data = response.json()
             
             if "result" not in data or not data["result"]:
@@ -34,7 +40,7 @@ class HeliusMonitor:
             # 第二步：批量解析交易详情 (Parsed Transactions)
             # 这一步是之前缺失的，必须把签名换成详细数据
             parse_url = f"https://api.helius.xyz/v0/transactions?api-key={self.api_key}"
-            parse_res = requests.post(parse_url, json={"transactions": signatures}, timeout=15)
+            parse_res = self.session.post(parse_url, json={"transactions": signatures}, timeout=15)
             
             if parse_res.status_code == 200:
                 parsed_data = parse_res.json()
@@ -55,7 +61,7 @@ class HeliusMonitor:
         """获取单笔交易详情 (保留备用)"""
         try:
             url = f"https://api.helius.xyz/v0/transactions/?api-key={self.api_key}"
-            res = requests.post(url, json={"transactions": [signature]}, timeout=10)
+            res = self.session.post(url, json={"transactions": [signature]}, timeout=10)
             if res.status_code == 200:
                 data = res.json()
                 if data and isinstance(data, list):
@@ -71,7 +77,7 @@ class HeliusMonitor:
                 "jsonrpc": "2.0", "id": "sol-price", "method": "getAsset",
                 "params": {"id": self.wsol_mint}
             }
-            res = requests.post(self.rpc_url, json=payload, timeout=5)
+            res = self.session.post(self.rpc_url, json=payload, timeout=5)
             data = res.json()
             if "result" in data:
                 return float(data["result"]["token_info"]["price_info"]["price_per_token"])
@@ -80,6 +86,33 @@ class HeliusMonitor:
         
         return 0.0
 
+    def get_token_prices(self, mints):
+        """
+        批量获取代币价格（只查价格，不拉取完整资产列表）
+        
+        返回: {mint: price}，请求失败返回 None
+        """
+        if not mints:
+            return {}
+        try:
+            payload = {
+                "jsonrpc": "2.0", "id": "prices", "method": "getAssetBatch",
+                "params": {"ids": list(mints)}
+            }
+            res = self.session.post(self.rpc_url, json=payload, timeout=10).json()
+            prices = {}
+            for item in res.get("result") or []:
+                if not item:
+                    continue
+                price_info = (item.get("token_info") or {}).get("price_info") or {}
+                price = price_info.get("price_per_token") or 0  # 字段存在但为 null 时也按无价格处理
+                if price > 0:
+                    prices[item.get("id")] = float(price)
+            return prices
+        except Exception as e:
+            logger.error(f"批量获取价格失败: {e}")
+            return None
+
     def get_assets_raw(self):
         """
         获取资产列表
@@ -89,7 +122,7 @@ class HeliusMonitor:
         # 1. SOL
         try:
             payload = {"jsonrpc": "2.0", "id": "sol", "method": "getBalance", "params": [self.target_wallet]}
-            res = requests.post(self.rpc_url, json=payload, timeout=5).json()
+            res = self.session.post(self.rpc_url, json=payload, timeout=5).json()
             sol_bal = res.get("result", {}).get("value", 0) / 1e9 if isinstance(res.get("result"), dict) else res.get("result", 0) / 1e9
             
             if sol_bal > 0:
@@ -115,7 +148,7 @@ class HeliusMonitor:
                     "displayOptions": {"showFungible": True}
                 }
             }
-            res = requests.post(self.rpc_url, json=payload, timeout=10).json()
+            res = self.session.post(self.rpc_url, json=payload, timeout=10).json()
             if "result" in res and "items" in res["result"]:
                 final_assets.extend(res["result"]["items"])
         except Exception as e:
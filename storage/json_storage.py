@@ -1,6 +1,8 @@
 import json
 import os
 import time
+import threading
+from contextlib import contextmanager
 
 class JsonStorage:
     def __init__(self, wallet_address):
@@ -38,6 +40,17 @@ class JsonStorage:
         self.balance_history_file = os.path.join(self.session_dir, "balance_history.json")
         self.positions_file = os.path.join(self.session_dir, "positions.json")
         self.trades_file = os.path.join(self.session_dir, "trades.json")
+        
+        # 会话元数据内存缓存（按文件路径区分会话；读写都经过本类，缓存与磁盘保持一致）
+        self._metadata_cache = None
+        self._metadata_cache_path = None
+        
+        # 批量写入：batch() 块内的写入暂存于此 {文件路径: 数据}，退出时每个文件只写一次
+        self._batch_depth = 0
+        self._pending_writes = {}
+        
+        # 交易记录/余额历史可能由后台写盘线程追加，读-改-写整个文件时加锁
+        self._log_lock = threading.Lock()
 
     def load_assets(self):
         """加载资产数据"""
@@ -196,9 +209,15 @@ class JsonStorage:
         保存所有持仓
         
         参数:
-            positions_dict: dict - {mint: position_dict}
+            positions_dict: dict - {mint: position_dict}，
+                            或已编码好的 JSON 字节（直接写入，不再序列化）
         """
         try:
+            if isinstance(positions_dict, bytes):
+                with open(self.positions_file, 'wb') as f:
+                    f.write(positions_dict)
+                return
+            
             with open(self.positions_file, 'w', encoding='utf-8') as f:
                 json.dump(positions_dict, f, ensure_ascii=False, indent=2)
         except Exception as e:
@@ -228,6 +247,74 @@ class JsonStorage:
             del positions[mint]
             self.save_positions(positions)
     
+    # ========== 批量写入 ==========
+    
+    @contextmanager
+    def batch(self):
+        """
+        批量写入上下文
+        
+        块内的余额、会话元数据写入先暂存在内存，
+        退出时每个文件只写一次（块内读取这些数据会拿到暂存的最新值）。
+        交易记录和余额历史是追加写，用 append_trades / append_balance_history 批量写入。
+        可以嵌套，最外层退出时统一写盘。
+        
+        用法:
+            with storage.batch():
+                ...连续执行多笔交易...
+        """
+        self._batch_depth += 1
+        try:
+            yield self
+        finally:
+            self._batch_depth -= 1
+            if self._batch_depth == 0:
+                self._commit_batch()
+    
+    def _write_json(self, path, data):
+        """
+        写 JSON 文件（批量写入期间只暂存，由 _commit_batch 统一写出）
+        
+        参数:
+            path: str - 文件路径
+            data: 要保存的数据
+        """
+        if self._batch_depth:
+            self._pending_writes[path] = data
+            return
+        
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False, indent=2)
+    
+    def _replace_json(self, path, records):
+        """
+        原子写 JSON 记录列表（写临时文件后 os.replace）
+        
+        每条记录一行：不带 indent 的 json.dumps 走 C 编码器，
+        整个文件拼成一个字符串后一次写入（indent=2 会退回纯 Python 编码器并逐块 write）
+        
+        参数:
+            path: str - 文件路径
+            records: list - 记录列表
+        """
+        dumps = json.dumps
+        content = "[\n" + ",\n".join([dumps(record, ensure_ascii=False) for record in records]) + "\n]"
+        
+        tmp_path = path + ".tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            f.write(content)
+        os.replace(tmp_path, path)
+    
+    def _commit_batch(self):
+        """写出批量写入期间暂存的所有文件"""
+        pending, self._pending_writes = self._pending_writes, {}
+        for path, data in pending.items():
+            try:
+                with open(path, 'w', encoding='utf-8') as f:
+                    json.dump(data, f, ensure_ascii=False, indent=2)
+            except Exception as e:
+                print(f"❌ 批量写入失败 [{os.path.basename(path)}]: {e}")
+    
     # ========== 交易记录管理 ==========
     
     def load_trades(self, filters=None):
@@ -247,25 +334,24 @@ class JsonStorage:
         try:
             with open(self.trades_file, 'r', encoding='utf-8') as f:
                 trades = json.load(f)
-            
-            # 应用筛选条件
-            if filters:
-                filtered = []
-                for trade in trades:
-                    match = True
-                    for key, value in filters.items():
-                        if trade.get(key) != value:
-                            match = False
-                            break
-                    if match:
-                        filtered.append(trade)
-                return filtered
-            
-            return trades
-        
         except Exception as e:
             print(f"❌ 加载交易记录失败: {e}")
             return []
+        
+        # 应用筛选条件
+        if filters:
+            filtered = []
+            for trade in trades:
+                match = True
+                for key, value in filters.items():
+                    if trade.get(key) != value:
+                        match = False
+                        break
+                if match:
+                    filtered.append(trade)
+            return filtered
+        
+        return trades
     
     def save_trade(self, trade_data):
         """
@@ -274,23 +360,35 @@ class JsonStorage:
         参数:
             trade_data: dict - 交易数据
         """
-        try:
-            # 加载现有记录
-            trades = self.load_trades()
-            
-            # 添加时间戳和ID
-            trade_data['saved_at'] = time.strftime("%Y-%m-%d %H:%M:%S")
-            trade_data.setdefault('trade_id', f"{int(time.time())}_{len(trades)}")
-            
-            # 追加新记录
-            trades.append(trade_data)
-            
-            # 保存
-            with open(self.trades_file, 'w', encoding='utf-8') as f:
-                json.dump(trades, f, ensure_ascii=False, indent=2)
+        self.append_trades([trade_data])
+    
+    def append_trades(self, trades):
+        """
+        批量追加虚拟交易（整批只读写一次 trades.json）
         
-        except Exception as e:
-            print(f"❌ 保存交易记录失败: {e}")
+        参数:
+            trades: list - 交易数据列表（按时间顺序）
+        """
+        if not trades:
+            return
+        
+        with self._log_lock:
+            try:
+                # 加载现有记录
+                existing = self.load_trades()
+                
+                # 添加时间戳和ID，追加新记录
+                saved_at = time.strftime("%Y-%m-%d %H:%M:%S")
+                for trade_data in trades:
+                    trade_data['saved_at'] = saved_at
+                    trade_data.setdefault('trade_id', f"{int(time.time())}_{len(existing)}")
+                    existing.append(trade_data)
+                
+                # 保存（先写临时文件再替换，读取方不会读到写了一半的文件）
+                self._replace_json(self.trades_file, existing)
+            
+            except Exception as e:
+                print(f"❌ 保存交易记录失败: {e}")
     
     # ========== 余额管理 ==========
     
@@ -301,6 +399,10 @@ class JsonStorage:
         返回:
             float - 当前余额，如果文件不存在返回配置的初始余额
         """
+        pending = self._pending_writes.get(self.balance_file)
+        if pending is not None:
+            return pending.get('balance', 0.0)
+        
         if not os.path.exists(self.balance_file):
             # 首次运行，返回初始余额
             from config import TradingConfig
@@ -328,8 +430,7 @@ class JsonStorage:
                 'updated_at': time.strftime("%Y-%m-%d %H:%M:%S"),
                 'timestamp': int(time.time())
             }
-            with open(self.balance_file, 'w', encoding='utf-8') as f:
-                json.dump(data, f, ensure_ascii=False, indent=2)
+            self._write_json(self.balance_file, data)
         except Exception as e:
             print(f"❌ 保存余额失败: {e}")
     
@@ -525,7 +626,7 @@ class JsonStorage:
                     "min_liquidity": TradingConfig.MIN_LIQUIDITY,
                     "min_market_cap": TradingConfig.MIN_MARKET_CAP,
                     "max_market_cap": TradingConfig.MAX_MARKET_CAP,
-                    "blacklist_tokens": TradingConfig.BLACKLIST_TOKENS,
+                    "blacklist_tokens": sorted(TradingConfig.BLACKLIST_TOKENS),
                     "allow_virtual_deposit": TradingConfig.ALLOW_VIRTUAL_DEPOSIT,
                     "allow_virtual_withdrawal": TradingConfig.ALLOW_VIRTUAL_WITHDRAWAL
                 },
@@ -645,14 +746,21 @@ class JsonStorage:
         加载当前会话元数据
         
         返回:
-            dict - 元数据
+            dict - 元数据（内存缓存对象，修改后需调用 save_session_metadata 保存）
         """
+        # 同一会话只在首次读取时解析文件，之后直接返回缓存
+        if self._metadata_cache_path == self.metadata_file:
+            return self._metadata_cache
+        
         if not os.path.exists(self.metadata_file):
             return None
         
         try:
             with open(self.metadata_file, 'r', encoding='utf-8') as f:
-                return json.load(f)
+                metadata = json.load(f)
+            self._metadata_cache = metadata
+            self._metadata_cache_path = self.metadata_file
+            return metadata
         except Exception as e:
             print(f"❌ 加载会话元数据失败: {e}")
             return None
@@ -664,9 +772,12 @@ class JsonStorage:
         参数:
             metadata: dict - 元数据
         """
+        # 先更新缓存（写盘失败时内存中仍是最新数据）
+        self._metadata_cache = metadata
+        self._metadata_cache_path = self.metadata_file
+        
         try:
-            with open(self.metadata_file, 'w', encoding='utf-8') as f:
-                json.dump(metadata, f, ensure_ascii=False, indent=2)
+            self._write_json(self.metadata_file, metadata)
         except Exception as e:
             print(f"❌ 保存会话元数据失败: {e}")
             
@@ -682,55 +793,81 @@ class JsonStorage:
             related_trade_id: str - 关联的交易ID
             note: str - 备注
         """
-        from config import SystemConfig
-        
-        if not SystemConfig.ENABLE_BALANCE_HISTORY:
-            return
-        
-        # 加载现有历史
-        history = []
-        if os.path.exists(self.balance_history_file):
-            try:
-                with open(self.balance_history_file, 'r', encoding='utf-8') as f:
-                    history = json.load(f)
-            except:
-                history = []
-        
-        # 计算变化百分比
-        if len(history) > 0:
-            previous_balance = history[-1]['balance']
-            change_percent = (change / previous_balance) if previous_balance > 0 else 0.0
-        else:
-            change_percent = 0.0
-        
-        # 创建新记录
-        entry = {
-            "timestamp": int(time.time()),
-            "datetime": time.strftime("%Y-%m-%d %H:%M:%S"),
+        self.append_balance_history([{
             "balance": balance,
             "change": change,
-            "change_percent": change_percent,
             "reason": reason,
             "position_value": position_value,
-            "total_value": balance + position_value,
             "related_trade_id": related_trade_id,
             "note": note
-        }
+        }])
+    
+    def append_balance_history(self, changes):
+        """
+        批量添加余额历史记录（整批只读写一次 balance_history.json）
         
-        # 如果是交易相关，添加额外信息
-        if reason in ["buy", "sell"] and related_trade_id:
-            # 可以从trades.json读取更多信息
-            entry["token_symbol"] = note.split()[0] if note else ""
+        参数:
+            changes: list - 每项为 save_balance_history_entry 的参数字典
+                     （balance/change/reason，可选 position_value/related_trade_id/note/timestamp）
+        """
+        from config import SystemConfig
         
-        # 追加记录
-        history.append(entry)
+        if not SystemConfig.ENABLE_BALANCE_HISTORY or not changes:
+            return
         
-        # 保存
-        try:
-            with open(self.balance_history_file, 'w', encoding='utf-8') as f:
-                json.dump(history, f, ensure_ascii=False, indent=2)
-        except Exception as e:
-            print(f"❌ 保存余额历史失败: {e}")
+        with self._log_lock:
+            # 加载现有历史
+            history = []
+            if os.path.exists(self.balance_history_file):
+                try:
+                    with open(self.balance_history_file, 'r', encoding='utf-8') as f:
+                        history = json.load(f)
+                except:
+                    history = []
+            
+            for item in changes:
+                balance = item['balance']
+                change = item['change']
+                reason = item['reason']
+                position_value = item.get('position_value', 0.0)
+                related_trade_id = item.get('related_trade_id')
+                note = item.get('note', "")
+                timestamp = item.get('timestamp') or int(time.time())
+                
+                # 计算变化百分比
+                if len(history) > 0:
+                    previous_balance = history[-1]['balance']
+                    change_percent = (change / previous_balance) if previous_balance > 0 else 0.0
+                else:
+                    change_percent = 0.0
+                
+                # 创建新记录
+                entry = {
+                    "timestamp": timestamp,
+                    "datetime": time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(timestamp)),
+                    "balance": balance,
+                    "change": change,
+                    "change_percent": change_percent,
+                    "reason": reason,
+                    "position_value": position_value,
+                    "total_value": balance + position_value,
+                    "related_trade_id": related_trade_id,
+                    "note": note
+                }
+                
+                # 如果是交易相关，添加额外信息
+                if reason in ["buy", "sell"] and related_trade_id:
+                    # 可以从trades.json读取更多信息
+                    entry["token_symbol"] = note.split()[0] if note else ""
+                
+                # 追加记录
+                history.append(entry)
+            
+            # 保存
+            try:
+                self._replace_json(self.balance_history_file, history)
+            except Exception as e:
+                print(f"❌ 保存余额历史失败: {e}")
 
     def update_session_statistics(self, stats_update):
         """
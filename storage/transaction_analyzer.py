@@ -76,6 +76,33 @@ class TransactionAnalyzer:
         
         return analyzed_tx
     
+    @staticmethod
+    def analyze_batch(transactions, captured_at=None):
+        """
+        批量分析交易（整批共用同一个捕获时间）
+        
+        参数:
+            transactions: list - 原始交易列表
+            captured_at: float - 捕获时间戳（可选）
+        
+        返回:
+            list - 增强的交易数据列表（分析失败的交易会被跳过）
+        """
+        if captured_at is None:
+            captured_at = time.time()
+        
+        analyze = TransactionAnalyzer.analyze
+        analyzed_txs = []
+        append = analyzed_txs.append
+        
+        for tx in transactions:
+            try:
+                append(analyze(tx, captured_at))
+            except Exception as e:
+                print(f"⚠️ 分析交易失败: {e} | Sig: {tx.get('signature')}")
+        
+        return analyzed_txs
+    
     @staticmethod
     def _analyze_type(raw_type, description):
         """
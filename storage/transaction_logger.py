@@ -5,6 +5,7 @@
 - 保存交易记录到JSON
 - 追加模式写入
 - 去重处理
+- 内存缓存（避免每次保存都重新读取整个文件）
 """
 
 import os
@@ -39,6 +40,11 @@ class TransactionLogger:
             f"wallet_{short_addr}_transactions.json"
         )
         
+        # 内存缓存：文件未被外部修改时直接复用，签名集合用于 O(1) 去重
+        self._cache = None
+        self._cache_mtime = None  # 缓存对应的文件 mtime_ns
+        self._signatures = set()
+        
         # 初始化文件
         self._initialize_file()
     
@@ -75,12 +81,10 @@ class TransactionLogger:
             if self._is_duplicate(transactions, signature):
                 return False
             
-            # 追加新交易（放在最前面，保持最新的在上）
-            transactions.insert(0, analyzed_tx)
-            
-            # 保存
-            with open(self.transactions_file, 'w', encoding='utf-8') as f:
-                json.dump(transactions, f, ensure_ascii=False, indent=2)
+            # 新交易放在最前面（保持最新的在上）；在副本上拼接，写盘失败时缓存保持原样
+            # 保存成功后才登记签名，失败的交易重试时不会被当成重复
+            self._write_transactions([analyzed_tx] + transactions)
+            self._signatures.add(signature)
             
             print(f"💾 [交易记录] 已保存: {signature[:8]}... ({analyzed_tx['analyzed_type']})")
             return True
@@ -89,24 +93,96 @@ class TransactionLogger:
             print(f"❌ 保存交易记录失败: {e}")
             return False
     
+    def save_transactions(self, analyzed_txs):
+        """
+        批量保存交易记录（整批只读写一次文件）
+        
+        参数:
+            analyzed_txs: list - 分析后的交易数据（按时间从旧到新）
+        
+        返回:
+            list - 实际保存的交易（已跳过缺少签名和重复的交易）
+        """
+        if not analyzed_txs:
+            return []
+        
+        try:
+            # 读取现有数据（签名集合随缓存一起维护，用于去重）
+            transactions = self._load_transactions()
+            seen = self._signatures
+            
+            saved = []
+            new_signatures = set()  # 本批新签名：写盘成功后才并入 self._signatures
+            for analyzed_tx in analyzed_txs:
+                signature = analyzed_tx.get('signature')
+                if not signature:
+                    print("⚠️ 交易缺少signature，跳过保存")
+                    continue
+                if signature in seen or signature in new_signatures:
+                    continue
+                new_signatures.add(signature)
+                saved.append(analyzed_tx)
+            
+            if not saved:
+                return []
+            
+            # 新交易放在最前面（最新的在上），与逐条 insert(0) 的顺序一致；
+            # 在副本上拼接，写盘失败时缓存和签名集合都保持原样
+            self._write_transactions(saved[::-1] + transactions)
+            seen.update(new_signatures)
+            
+            for analyzed_tx in saved:
+                print(f"💾 [交易记录] 已保存: {analyzed_tx['signature'][:8]}... ({analyzed_tx['analyzed_type']})")
+            return saved
+        
+        except Exception as e:
+            print(f"❌ 批量保存交易记录失败: {e}")
+            return []
+    
     def _load_transactions(self):
-        """加载现有交易记录"""
-        if not os.path.exists(self.transactions_file):
+        """加载现有交易记录（文件 mtime 未变时直接返回内存缓存）"""
+        try:
+            mtime = os.stat(self.transactions_file).st_mtime_ns
+        except OSError:
             return []
         
+        if self._cache is not None and mtime == self._cache_mtime:
+            return self._cache
+        
         try:
             with open(self.transactions_file, 'r', encoding='utf-8') as f:
-                return json.load(f)
+                transactions = json.load(f)
         except Exception as e:
             print(f"⚠️ 读取交易记录失败: {e}")
             return []
+        
+        self._cache = transactions
+        self._cache_mtime = mtime
+        self._signatures = {tx.get('signature') for tx in transactions}
+        return transactions
+    
+    def _write_transactions(self, transactions):
+        """
+        写入交易记录并刷新缓存
+        
+        json.dumps 不带 indent 时走 C 编码器（indent 或 json.dump 写文件都会退回纯 Python 实现），
+        先整体序列化并编码成一个 bytes 缓冲，再用无缓冲的二进制文件一次写入
+        （跳过文本层的分块编码和用户态缓冲区拷贝），写临时文件后原子替换，避免中途崩溃留下半截 JSON
+        """
+        data = json.dumps(transactions, ensure_ascii=False).encode('utf-8')
+        tmp_path = self.transactions_file + ".tmp"
+        with open(tmp_path, 'wb', buffering=0) as f:
+            view = memoryview(data)
+            while view:
+                view = view[f.write(view):]
+        os.replace(tmp_path, self.transactions_file)
+        
+        self._cache = transactions
+        self._cache_mtime = os.stat(self.transactions_file).st_mtime_ns
     
     def _is_duplicate(self, transactions, signature):
-        """检查是否重复"""
-        for tx in transactions:
-            if tx.get('signature') == signature:
-                return True
-        return False
+        """检查是否重复（签名集合 O(1) 查找）"""
+        return signature in self._signatures
     
     def get_latest_signature(self):
         """获取最新的交易签名（用于初始化）"""